@@ -1,4 +1,5 @@
 import json
+import orjson
 from typing import Annotated, Union
 from core.dependencies import get_db
 from fastapi.responses import StreamingResponse
@@ -497,8 +498,8 @@ async def export_controller_config(
     try:
         result = await export_modbus_controller_config_data(controller_id, export_format, db)
         
-        # Convert config to JSON string
-        json_content = json.dumps(result["config_data"], indent=2, ensure_ascii=False)
+        # Serialize straight to UTF-8 bytes; skips the intermediate str and its re-encode
+        json_content = orjson.dumps(result["config_data"], option=orjson.OPT_INDENT_2)
         
         # Create streaming response
         return StreamingResponse(
@@ -376,7 +376,6 @@ async def create_modbus_points_batch(
                     
                     db.add(point)
                     await db.commit()
-                    await db.refresh(point)
                     
                     results.append(ModbusPointBatchCreateResult(
                         point_id=point.id,
@@ -886,7 +885,7 @@ async def export_modbus_controller_config_data(
         if not controller:
             raise ModbusControllerNotFoundException(f"Controller {controller_id} not found")
         
-        config = await export_modbus_config(controller_id, db, format)
+        config = await export_modbus_config(controller_id, db, format, controller)
         
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         filename = f"modbus_{controller.name}_{format}_{timestamp}.json"
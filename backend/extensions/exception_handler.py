@@ -1,9 +1,23 @@
 from utils.response import APIResponse
+from utils.custom_exception import BaseServiceException
 from fastapi.responses import JSONResponse
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.exceptions import RequestValidationError
 
 def add_exception_handlers(app: FastAPI):
+    @app.exception_handler(BaseServiceException)
+    async def service_exception_handler(request: Request, exc: BaseServiceException):
+        # Server errors often wrap DB or driver messages; only expose the generic text
+        if exc.status_code >= 500:
+            message = exc.default_message or "Internal Server Error"
+        else:
+            message = exc.message
+        resp = APIResponse(code=exc.status_code, message=message, data=None)
+        return JSONResponse(
+            status_code=exc.status_code,
+            content=resp.dict(exclude_none=True)
+        )
+
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
         status_code = exc.status_code
@@ -1,7 +1,9 @@
+import asyncio
 from api import api_router
 from fastapi import FastAPI
 from core.database import init_db
 from websocket import websocket_router
+from websocket.manager import get_manager
 from extensions.modbus import get_modbus
 from fastapi_limiter import FastAPILimiter
 from contextlib import asynccontextmanager
@@ -21,11 +23,19 @@ async def lifespan(app: FastAPI):
     scheduler.start()
     await init_redis()
     await FastAPILimiter.init(get_redis())
+    await get_manager().ensure_redis_reset()
+    ws_tasks = [
+        asyncio.create_task(get_manager().listen_broadcasts()),
+        asyncio.create_task(get_manager().flush_ws_events()),
+    ]
     
     # Initialize Modbus connections
     # await get_modbus().initialize_from_database()
     
     yield
+    for task in ws_tasks:
+        task.cancel()
+    await asyncio.gather(*ws_tasks, return_exceptions=True)
     scheduler.shutdown()
 
 # Create FastAPI app instance
@@ -1,9 +1,12 @@
 import uuid
 from core.database import Base
-from sqlalchemy import Column, String, Integer, Text, ForeignKey, Float, TIMESTAMP, text
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, Float, TIMESTAMP, Index, text
 
 class ModbusPoint(Base):
     __tablename__ = "modbus_point"
+    __table_args__ = (
+        Index("ix_modbus_point_controller_id_unit_id_address_type", "controller_id", "unit_id", "address", "type"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), comment="點位 ID")
     controller_id = Column(String(36), ForeignKey("modbus_controller.id"), nullable=False, comment="控制器 ID")
@@ -1,9 +1,12 @@
 import uuid
 from core.database import Base
-from sqlalchemy import Column, String, JSON, Text, Boolean, TIMESTAMP, text
+from sqlalchemy import Column, String, JSON, Text, Boolean, TIMESTAMP, Index, text
 
 class WebPushSubscription(Base):
     __tablename__ = "webpush_subscription"
+    __table_args__ = (
+        Index("ix_webpush_subscription_user_id_is_active", "user_id", "is_active"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), comment="訂閱 ID")
     user_id = Column(String(36), nullable=False, comment="使用者 ID")
@@ -1,9 +1,12 @@
 import uuid
 from core.database import Base
-from sqlalchemy import Column, String, TIMESTAMP, text
+from sqlalchemy import Column, String, TIMESTAMP, Index, text
 
 class WebSocketEvents(Base):
     __tablename__ = "websocket_events"
+    __table_args__ = (
+        Index("ix_websocket_events_user_id_event_type_event_time", "user_id", "event_type", "event_time"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), comment="事件 ID")
     user_id = Column(String(36), nullable=False, comment="使用者 ID")
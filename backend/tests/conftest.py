@@ -3,18 +3,28 @@ import asyncio
 import pytest_asyncio
 from main import app
 from core.config import settings
+from tests.helpers import MOCK_BEARER_TOKEN
 from core.dependencies import get_db
+from core.security import verify_token
 from sqlalchemy.pool import StaticPool
 from unittest.mock import AsyncMock, patch, Mock, MagicMock
 from httpx import AsyncClient, ASGITransport
 from core.database import Base, make_async_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
-@pytest_asyncio.fixture(scope="function")
+try:
+    # Installed with uvicorn[standard] (via fastapi[all]); unavailable on Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+@pytest_asyncio.fixture(scope="session")
 async def test_engine():
     """
-    Create an isolated database engine for each test.
-    Uses optimized connection settings for testing.
+    Create a single database engine shared by the whole test session.
+    Reuses one connection instead of reconnecting for every test.
+    The schema is created once here and only emptied between tests.
     """
     engine = create_async_engine(
         make_async_url(settings.DATABASE_URL_TEST),
@@ -45,7 +55,8 @@ async def test_engine():
 async def test_db_session(test_engine):
     """
     Create an isolated database session for each test.
-    Automatically handles transaction rollback after each test.
+    Automatically handles transaction rollback after each test,
+    then empties every table so the next test starts clean.
     """
     TestSessionLocal = async_sessionmaker(
         bind=test_engine,
@@ -55,19 +66,28 @@ async def test_db_session(test_engine):
         autocommit=False
     )
     
-    async with TestSessionLocal() as session:
-        # Start a transaction that will be rolled back after the test
-        transaction = await session.begin()
-        try:
-            yield session
-        finally:
-            # Check if transaction is still active before rollback
+    try:
+        async with TestSessionLocal() as session:
+            # Start a transaction that will be rolled back after the test
+            transaction = await session.begin()
             try:
-                if transaction.is_active:
-                    await transaction.rollback()
-            except Exception:
-                # Transaction might already be closed, ignore the error
-                pass
+                yield session
+            finally:
+                # Check if transaction is still active before rollback
+                try:
+                    if transaction.is_active:
+                        await transaction.rollback()
+                except Exception:
+                    # Transaction might already be closed, ignore the error
+                    pass
+    finally:
+        # Tests commit their data, so remove it in reverse dependency order.
+        # DELETE keeps the schema in place; MariaDB's TRUNCATE recreates the table
+        # and is rejected for tables referenced by a foreign key.
+        # engine.begin() commits on exit, so the cleanup is never silently lost.
+        async with test_engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                await conn.execute(table.delete())
 
 
 @pytest_asyncio.fixture
@@ -87,6 +107,7 @@ async def mock_redis():
     
     mock.smembers.return_value = set()
     mock.hgetall.return_value = {}
+    mock.hkeys.return_value = []
     mock.get.return_value = None
     mock.sadd.return_value = True
     mock.srem.return_value = True
@@ -330,14 +351,22 @@ async def client(test_db_session, mock_redis, mock_modbus):
             app.dependency_overrides.clear()
 
 
+@pytest_asyncio.fixture
+async def authorized(client):
+    """
+    Bypass Keycloak token verification through FastAPI's dependency overrides.
+    Cheaper than patching get_keycloak per test; the token is returned as-is.
+    """
+    app.dependency_overrides[verify_token] = lambda: MOCK_BEARER_TOKEN
+    yield MOCK_BEARER_TOKEN
+    app.dependency_overrides.pop(verify_token, None)
+
+
 @pytest.fixture(scope="session")
-def event_loop():
+def event_loop_policy():
     """
-    Create a session-scoped event loop for pytest-asyncio.
-    This resolves event loop conflicts between httpx AsyncClient and database engine.
+    Event loop policy used by pytest-asyncio for the session-scoped loop.
+    Sharing one loop avoids conflicts between httpx AsyncClient and the database engine.
+    Runs on uvloop when it is installed.
     """
-    policy = asyncio.get_event_loop_policy()
-    loop = policy.new_event_loop()
-    asyncio.set_event_loop(loop)
-    yield loop
-    loop.close()
\ No newline at end of file
+    return uvloop.EventLoopPolicy() if uvloop else asyncio.DefaultEventLoopPolicy()
@@ -0,0 +1,15 @@
+"""
+Constants and helpers shared by the test modules
+"""
+import orjson
+
+MOCK_BEARER_TOKEN = "mocktoken"
+AUTH_HEADERS = {"Authorization": f"Bearer {MOCK_BEARER_TOKEN}"}
+
+
+def read_json(response):
+    """
+    Parse a response body straight from bytes with orjson,
+    skipping the bytes-to-str decode done by response.json().
+    """
+    return orjson.loads(response.content)
@@ -1,11 +1,10 @@
 import pytest
 from datetime import datetime
 from unittest.mock import patch, AsyncMock
+from tests.helpers import AUTH_HEADERS
 
 @pytest.mark.asyncio
 async def test_get_users_success(client):
-    fake_token = "fake_token"
-    
     # Mock Keycloak data
     fake_users = [
         {
@@ -47,7 +46,7 @@ async def test_get_users_success(client):
          patch("websocket.manager.ConnectionManager.get_user_last_ws_login", new_callable=AsyncMock, return_value=(True, fake_last_login)):
         response = await client.get(
             "/api/admin/users",
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         data = response.json()
@@ -56,7 +55,6 @@ async def test_get_users_success(client):
 
 @pytest.mark.asyncio
 async def test_get_users_with_filters(client):
-    fake_token = "fake_token"
     fake_users = []
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
@@ -71,14 +69,13 @@ async def test_get_users_with_filters(client):
          patch("websocket.manager.ConnectionManager.get_user_last_ws_login", new_callable=AsyncMock, return_value=(False, fake_last_login)):
         response = await client.get(
             "/api/admin/users?name=test&status=true&role=admin&page=1&per_page=5&sort_by=username&desc=false",
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         assert response.json()["code"] == 200
 
 @pytest.mark.asyncio
 async def test_create_user_success(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -100,7 +97,7 @@ async def test_create_user_success(client):
         response = await client.post(
             "/api/admin/users", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         data = response.json()
@@ -109,7 +106,6 @@ async def test_create_user_success(client):
 
 @pytest.mark.asyncio
 async def test_create_user_email_exists(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -133,13 +129,12 @@ async def test_create_user_email_exists(client):
         response = await client.post(
             "/api/admin/users", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 409
 
 @pytest.mark.asyncio
 async def test_update_user_success(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
     fake_current_user = {"id": "user123", "email": "old@example.com"}
@@ -161,14 +156,13 @@ async def test_update_user_success(client):
         response = await client.put(
             "/api/admin/users/user123", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         assert response.json()["message"] == "User updated successfully"
 
 @pytest.mark.asyncio
 async def test_update_user_not_found(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -185,13 +179,12 @@ async def test_update_user_not_found(client):
         response = await client.put(
             "/api/admin/users/nonexistent", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 404
 
 @pytest.mark.asyncio
 async def test_delete_users_success(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -205,7 +198,7 @@ async def test_delete_users_success(client):
             "DELETE",
             "/api/admin/users",
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         data = response.json()
@@ -214,7 +207,6 @@ async def test_delete_users_success(client):
 
 @pytest.mark.asyncio
 async def test_delete_users_partial_success(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -234,7 +226,7 @@ async def test_delete_users_partial_success(client):
             "DELETE",
             "/api/admin/users",
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 207
         data = response.json()
@@ -254,7 +246,6 @@ async def test_delete_users_partial_success(client):
 
 @pytest.mark.asyncio
 async def test_delete_users_all_failed(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -268,7 +259,7 @@ async def test_delete_users_all_failed(client):
             "DELETE",
             "/api/admin/users",
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 400
         data = response.json()
@@ -279,7 +270,6 @@ async def test_delete_users_all_failed(client):
 
 @pytest.mark.asyncio
 async def test_reset_password_success(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -293,14 +283,13 @@ async def test_reset_password_success(client):
         response = await client.post(
             "/api/admin/users/user123/reset-password", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         assert response.json()["message"] == "Password reset successfully"
 
 @pytest.mark.asyncio
 async def test_reset_password_user_not_found(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -316,13 +305,12 @@ async def test_reset_password_user_not_found(client):
         response = await client.post(
             "/api/admin/users/nonexistent/reset-password", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 404
 
 @pytest.mark.asyncio
 async def test_get_roles_success(client):
-    fake_token = "fake_token"
     fake_realm_roles = [
         {"id": "role123", "name": "admin", "description": "Administrator role"},
         {"id": "role456", "name": "manager", "description": "Manager role"}
@@ -350,7 +338,7 @@ async def test_get_roles_success(client):
         
         response = await client.get(
             "/api/admin/roles",
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         data = response.json()
@@ -359,7 +347,6 @@ async def test_get_roles_success(client):
 
 @pytest.mark.asyncio
 async def test_create_role_success(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -375,7 +362,7 @@ async def test_create_role_success(client):
         response = await client.post(
             "/api/admin/roles", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         data = response.json()
@@ -384,7 +371,6 @@ async def test_create_role_success(client):
 
 @pytest.mark.asyncio
 async def test_create_role_already_exists(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -403,13 +389,12 @@ async def test_create_role_already_exists(client):
         response = await client.post(
             "/api/admin/roles", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 409
 
 @pytest.mark.asyncio
 async def test_update_role_success(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
     fake_existing_role = {"name": "testrole", "description": "Old description"}
@@ -423,14 +408,13 @@ async def test_update_role_success(client):
         response = await client.put(
             "/api/admin/roles/testrole", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         assert response.json()["message"] == "Role updated successfully"
 
 @pytest.mark.asyncio
 async def test_update_role_not_found(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -448,13 +432,12 @@ async def test_update_role_not_found(client):
         response = await client.put(
             "/api/admin/roles/nonexistent", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 404
 
 @pytest.mark.asyncio
 async def test_update_role_attributes_success(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
     fake_existing_role = {"name": "testrole", "attributes": {"old": ["value"]}}
@@ -473,14 +456,13 @@ async def test_update_role_attributes_success(client):
         response = await client.put(
             "/api/admin/roles/testrole/attributes", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         assert response.json()["message"] == "Role attributes updated successfully"
 
 @pytest.mark.asyncio
 async def test_update_role_attributes_not_found(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -498,13 +480,12 @@ async def test_update_role_attributes_not_found(client):
         response = await client.put(
             "/api/admin/roles/nonexistent/attributes", 
             json=payload,
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 404
 
 @pytest.mark.asyncio
 async def test_delete_role_success(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -515,14 +496,13 @@ async def test_delete_role_success(client):
          patch("extensions.keycloak.KeycloakAdmin.a_delete_realm_role", return_value=None):
         response = await client.delete(
             "/api/admin/roles/testrole",
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         assert response.json()["message"] == "Role deleted successfully"
 
 @pytest.mark.asyncio
 async def test_delete_role_not_found(client):
-    fake_token = "fake_token"
     fake_user_roles = [{"name": "admin"}]
     fake_role_info = {"attributes": {"admin": ["true"]}}
 
@@ -538,6 +518,6 @@ async def test_delete_role_not_found(client):
          patch("extensions.keycloak.KeycloakAdmin.a_delete_realm_role", side_effect=mock_delete_role_error):
         response = await client.delete(
             "/api/admin/roles/nonexistent",
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 404
\ No newline at end of file
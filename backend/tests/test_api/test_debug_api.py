@@ -2,7 +2,7 @@ import pytest
 from fastapi import Request
 from utils.get_real_ip import get_real_ip
 from unittest.mock import Mock, AsyncMock, patch
-from starlette.datastructures import Address, Headers
+from starlette.datastructures import Address, Headers, State
 
 class TestGetRealIP:
     """Tests for get_real_ip function"""
@@ -12,6 +12,7 @@ class TestGetRealIP:
         request = Mock(spec=Request)
         request.headers = Headers(headers or {})
         request.client = Address(client_host, 8000) if client_host else None
+        request.state = State()
         return request
     
     def test_get_real_ip_from_x_forwarded_for(self):
@@ -64,6 +65,37 @@ class TestGetRealIP:
         
         result = get_real_ip(request)
         assert result == "192.168.1.100"
+    
+    def test_get_real_ip_invalid_forwarded_for(self):
+        """Test malformed X-Forwarded-For falls back to the next source"""
+        request = self.create_mock_request({
+            "x-forwarded-for": "999.1.1.1, 10.0.0.1",
+            "x-real-ip": "203.0.113.45"
+        })
+        
+        result = get_real_ip(request)
+        assert result == "203.0.113.45"
+    
+    def test_get_real_ip_ipv6_forwarded_for(self):
+        """Test IPv6 address in X-Forwarded-For"""
+        request = self.create_mock_request({
+            "x-forwarded-for": "2001:db8::1"
+        })
+        
+        result = get_real_ip(request)
+        assert result == "2001:db8::1"
+    
+    def test_get_real_ip_cached_on_request_state(self):
+        """Test the resolved IP is cached on request.state"""
+        request = self.create_mock_request({
+            "x-forwarded-for": "192.168.1.100"
+        })
+        
+        assert get_real_ip(request) == "192.168.1.100"
+        assert request.state.real_ip == "192.168.1.100"
+        
+        request.headers = Headers({"x-forwarded-for": "10.0.0.1"})
+        assert get_real_ip(request) == "192.168.1.100"
 
 
 class TestClearBlockedIPs:
@@ -1,10 +1,9 @@
 import json
 import pytest
 import io
-import os
-import shutil
 from unittest.mock import AsyncMock, Mock, patch
 from httpx import AsyncClient
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.modbus_controller import ModbusController
 from models.modbus_point import ModbusPoint
@@ -101,23 +100,22 @@ class TestModbusControllerAPI:
     
     @pytest.mark.asyncio
     async def test_get_controllers_with_filters(self, client: AsyncClient, test_db_session: AsyncSession):
-        controller1 = ModbusController(
-            name="Controller 1",
-            host="192.168.1.100",
-            port=502,
-            timeout=10,
-            status=True
-        )
-        controller2 = ModbusController(
-            name="Controller 2",
-            host="192.168.1.101",
-            port=502,
-            timeout=5,
-            status=False
-        )
-        
-        test_db_session.add(controller1)
-        test_db_session.add(controller2)
+        await test_db_session.execute(insert(ModbusController), [
+            {
+                "name": "Controller 1",
+                "host": "192.168.1.100",
+                "port": 502,
+                "timeout": 10,
+                "status": True
+            },
+            {
+                "name": "Controller 2",
+                "host": "192.168.1.101",
+                "port": 502,
+                "timeout": 5,
+                "status": False
+            }
+        ])
         await test_db_session.commit()
         
         response = await client.get("/api/modbus/controllers?status=true")
@@ -377,27 +375,26 @@ class TestModbusPointAPI:
         test_db_session.add(controller)
         await test_db_session.commit()
         
-        point1 = ModbusPoint(
-            controller_id=controller.id,
-            name="Temperature 1",
-            type="holding_register",
-            data_type="uint16",
-            address=40001,
-            len=1,
-            unit_id=1
-        )
-        point2 = ModbusPoint(
-            controller_id=controller.id,
-            name="Pressure 1",
-            type="input_register",
-            data_type="uint16",
-            address=30001,
-            len=1,
-            unit_id=1
-        )
-        
-        test_db_session.add(point1)
-        test_db_session.add(point2)
+        await test_db_session.execute(insert(ModbusPoint), [
+            {
+                "controller_id": controller.id,
+                "name": "Temperature 1",
+                "type": "holding_register",
+                "data_type": "uint16",
+                "address": 40001,
+                "len": 1,
+                "unit_id": 1
+            },
+            {
+                "controller_id": controller.id,
+                "name": "Pressure 1",
+                "type": "input_register",
+                "data_type": "uint16",
+                "address": 30001,
+                "len": 1,
+                "unit_id": 1
+            }
+        ])
         await test_db_session.commit()
         
         response = await client.get(f"/api/modbus/controllers/{controller.id}/points")
@@ -420,27 +417,26 @@ class TestModbusPointAPI:
         test_db_session.add(controller)
         await test_db_session.commit()
         
-        point1 = ModbusPoint(
-            controller_id=controller.id,
-            name="Temperature 1",
-            type="holding_register",
-            data_type="uint16",
-            address=40001,
-            len=1,
-            unit_id=1
-        )
-        point2 = ModbusPoint(
-            controller_id=controller.id,
-            name="Pressure 1",
-            type="input_register",
-            data_type="uint16",
-            address=30001,
-            len=1,
-            unit_id=1
-        )
-        
-        test_db_session.add(point1)
-        test_db_session.add(point2)
+        await test_db_session.execute(insert(ModbusPoint), [
+            {
+                "controller_id": controller.id,
+                "name": "Temperature 1",
+                "type": "holding_register",
+                "data_type": "uint16",
+                "address": 40001,
+                "len": 1,
+                "unit_id": 1
+            },
+            {
+                "controller_id": controller.id,
+                "name": "Pressure 1",
+                "type": "input_register",
+                "data_type": "uint16",
+                "address": 30001,
+                "len": 1,
+                "unit_id": 1
+            }
+        ])
         await test_db_session.commit()
         
         response = await client.get(f"/api/modbus/controllers/{controller.id}/points?point_type=holding_register")
@@ -666,30 +662,29 @@ class TestModbusDataAPI:
         test_db_session.add(controller)
         await test_db_session.commit()
         
-        point1 = ModbusPoint(
-            controller_id=controller.id,
-            name="Temperature 1",
-            type="holding_register",
-            data_type="uint16",
-            address=40001,
-            len=1,
-            unit_id=1,
-            formula="x * 0.1",
-            unit="°C"
-        )
-        point2 = ModbusPoint(
-            controller_id=controller.id,
-            name="Pressure 1",
-            type="input_register",
-            data_type="uint16",
-            address=30001,
-            len=1,
-            unit_id=1,
-            unit="bar"
-        )
-        
-        test_db_session.add(point1)
-        test_db_session.add(point2)
+        await test_db_session.execute(insert(ModbusPoint), [
+            {
+                "controller_id": controller.id,
+                "name": "Temperature 1",
+                "type": "holding_register",
+                "data_type": "uint16",
+                "address": 40001,
+                "len": 1,
+                "unit_id": 1,
+                "formula": "x * 0.1",
+                "unit": "°C"
+            },
+            {
+                "controller_id": controller.id,
+                "name": "Pressure 1",
+                "type": "input_register",
+                "data_type": "uint16",
+                "address": 30001,
+                "len": 1,
+                "unit_id": 1,
+                "unit": "bar"
+            }
+        ])
         await test_db_session.commit()
         
         response = await client.get(f"/api/modbus/controllers/{controller.id}/points/data")
@@ -714,27 +709,26 @@ class TestModbusDataAPI:
         test_db_session.add(controller)
         await test_db_session.commit()
         
-        point1 = ModbusPoint(
-            controller_id=controller.id,
-            name="Temperature 1",
-            type="holding_register",
-            data_type="uint16",
-            address=40001,
-            len=1,
-            unit_id=1
-        )
-        point2 = ModbusPoint(
-            controller_id=controller.id,
-            name="Pressure 1",
-            type="input_register",
-            data_type="uint16",
-            address=30001,
-            len=1,
-            unit_id=1
-        )
-        
-        test_db_session.add(point1)
-        test_db_session.add(point2)
+        await test_db_session.execute(insert(ModbusPoint), [
+            {
+                "controller_id": controller.id,
+                "name": "Temperature 1",
+                "type": "holding_register",
+                "data_type": "uint16",
+                "address": 40001,
+                "len": 1,
+                "unit_id": 1
+            },
+            {
+                "controller_id": controller.id,
+                "name": "Pressure 1",
+                "type": "input_register",
+                "data_type": "uint16",
+                "address": 30001,
+                "len": 1,
+                "unit_id": 1
+            }
+        ])
         await test_db_session.commit()
         
         response = await client.get(f"/api/modbus/controllers/{controller.id}/points/data?point_type=holding_register")
@@ -866,37 +860,37 @@ class TestModbusConfigAPI:
         await test_db_session.commit()
         
         # Create some points for the controller
-        point1 = ModbusPoint(
-            controller_id=controller.id,
-            name="Temperature 1",
-            type="holding_register",
-            data_type="uint16",
-            address=40001,
-            len=1,
-            unit_id=1
-        )
-        point2 = ModbusPoint(
-            controller_id=controller.id,
-            name="Pressure 1",
-            type="input_register",
-            data_type="uint16",
-            address=30001,
-            len=1,
-            unit_id=1
-        )
-        test_db_session.add(point1)
-        test_db_session.add(point2)
+        await test_db_session.execute(insert(ModbusPoint), [
+            {
+                "controller_id": controller.id,
+                "name": "Temperature 1",
+                "type": "holding_register",
+                "data_type": "uint16",
+                "address": 40001,
+                "len": 1,
+                "unit_id": 1
+            },
+            {
+                "controller_id": controller.id,
+                "name": "Pressure 1",
+                "type": "input_register",
+                "data_type": "uint16",
+                "address": 30001,
+                "len": 1,
+                "unit_id": 1
+            }
+        ])
         await test_db_session.commit()
         
-        # Test export with Form data
-        response = await client.post(
+        # Test export with Form data; only headers are checked, so the body is never read
+        async with client.stream(
+            "POST",
             f"/api/modbus/export/{controller.id}",
             data={"export_format": "native"}
-        )
-        
-        assert response.status_code == 200
-        assert response.headers["content-type"] == "application/json"
-        assert "attachment" in response.headers["content-disposition"]
+        ) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            assert "attachment" in response.headers["content-disposition"]
 
     @pytest.mark.asyncio
     async def test_export_controller_config_not_found(self, client: AsyncClient, test_db_session: AsyncSession):
@@ -965,20 +959,55 @@ class TestModbusConfigAPI:
         
         assert response.status_code in [400, 415, 500]
 
-    @pytest.fixture(autouse=True)
-    def cleanup_exports_directory(self):
-        """Clean up exports directory before and after tests"""
-        exports_dir = "exports"
+    @pytest.mark.asyncio
+    async def test_import_config_malformed_point(self, client: AsyncClient, test_db_session: AsyncSession):
+        # A non-object point is a format error, not a server error
+        config_data = {
+            "controller": {
+                "name": "Imported Controller",
+                "host": "192.168.1.200",
+                "port": 502
+            },
+            "points": ["not an object"]
+        }
+        config_file = io.BytesIO(json.dumps(config_data).encode('utf-8'))
+        
+        files = {"file": ("config.json", config_file, "application/json")}
+        data = {
+            "config_format": "native",
+            "duplicate_handling": "skip_controller"
+        }
+        
+        response = await client.post("/api/modbus/import/controller", files=files, data=data)
+        
+        assert response.status_code == 415
+
+    @pytest.mark.asyncio
+    async def test_import_thingsboard_config_malformed_item(self, client: AsyncClient, test_db_session: AsyncSession):
+        # A non-object entry in a slave section is a format error, not a server error
+        config_data = {
+            "master": {
+                "slaves": [
+                    {
+                        "host": "192.168.1.200",
+                        "port": 502,
+                        "deviceName": "Imported Controller",
+                        "rpc": ["not an object"]
+                    }
+                ]
+            }
+        }
+        config_file = io.BytesIO(json.dumps(config_data).encode('utf-8'))
         
-        # Clean up before test
-        if os.path.exists(exports_dir):
-            shutil.rmtree(exports_dir)
+        files = {"file": ("config.json", config_file, "application/json")}
+        data = {
+            "config_format": "thingsboard",
+            "duplicate_handling": "skip_controller"
+        }
         
-        yield
+        response = await client.post("/api/modbus/import/controller", files=files, data=data)
         
-        # Clean up after test
-        if os.path.exists(exports_dir):
-            shutil.rmtree(exports_dir)
+        assert response.status_code == 415
 
 
 class TestModbusErrorHandling:
@@ -1033,20 +1062,11 @@ class TestModbusErrorHandling:
         """Test invalid port range handling"""
         mock_modbus = AsyncMock()
         
-        def mock_create_tcp(host, port, timeout=30):
-            # Simulate invalid port range error
-            if port > 65535:
-                raise ValueError("Port number out of range")
-            client_id = f"tcp_{host}_{port}"
-            mock_client = Mock()
-            mock_client.connected = False
-            mock_client.is_socket_open.return_value = False
-            mock_modbus.clients[client_id] = mock_client
-            mock_modbus.client_status[client_id] = False
-            return client_id
-        
-        # Set side_effect directly
-        mock_modbus.create_tcp = Mock(side_effect=mock_create_tcp)
+        # Invalid port raises first, valid port returns its client id
+        mock_modbus.create_tcp = Mock(side_effect=[
+            ValueError("Port number out of range"),
+            "tcp_192.168.1.100_502"
+        ])
         
         # Test invalid port
         with pytest.raises(ValueError, match="Port number out of range"):
@@ -2,10 +2,10 @@ import pytest
 from unittest.mock import patch, AsyncMock
 from datetime import datetime
 from utils.custom_exception import ServerException, InvalidPasswordException
+from tests.helpers import AUTH_HEADERS
 
 @pytest.mark.asyncio
 async def test_get_user_info_success(client):
-    fake_token = "fake_token"
     fake_userinfo = {
         "sub": "user123",
         "preferred_username": "testuser",
@@ -26,7 +26,7 @@ async def test_get_user_info_success(client):
 
         response = await client.get(
             "/api/user/info",
-            headers={"Authorization": f"Bearer {fake_token}"}
+            headers=AUTH_HEADERS
         )
         assert response.status_code == 200
         data = response.json()["data"]
@@ -47,7 +47,6 @@ async def test_get_user_info_invalid_token(client):
 
 @pytest.mark.asyncio
 async def test_update_user_info_success(client):
-    fake_token = "fake_token"
     fake_userinfo = {
         "sub": "user123",
         "preferred_username": "testuser",
@@ -66,7 +65,7 @@ async def test_update_user_info_success(client):
          patch("extensions.keycloak.KeycloakAdmin.a_update_user", new_callable=AsyncMock, return_value=None):
         response = await client.put(
             "/api/user/update",
-            headers={"Authorization": f"Bearer {fake_token}"},
+            headers=AUTH_HEADERS,
             json={
                 "firstName": "NewName",
                 "lastName": "User",
@@ -79,7 +78,6 @@ async def test_update_user_info_success(client):
 
 @pytest.mark.asyncio
 async def test_change_password_success(client):
-    fake_token = "fake_token"
     with patch("extensions.keycloak.KeycloakExtension.get_user_id", return_value="user123"), \
          patch("extensions.keycloak.KeycloakOpenID.a_userinfo", return_value={"sub": "user123", "preferred_username": "testuser"}), \
          patch("extensions.keycloak.KeycloakOpenID.a_token", new_callable=AsyncMock, return_value={"access_token": "abc"}), \
@@ -87,7 +85,7 @@ async def test_change_password_success(client):
          patch("extensions.keycloak.KeycloakAdmin.a_user_logout", new_callable=AsyncMock, return_value=None):
         response = await client.put(
             "/api/user/change-password",
-            headers={"Authorization": f"Bearer {fake_token}"},
+            headers=AUTH_HEADERS,
             json={"old_password": "oldpw123", "new_password": "newStrongPassword123"}
         )
         assert response.status_code == 200
@@ -106,8 +104,6 @@ async def test_change_password_invalid_token(client):
 
 @pytest.mark.asyncio
 async def test_change_password_wrong_old_password(client):
-    fake_token = "fake_token"
-    
     def mock_token_error(*args, **kwargs):
         raise Exception("Invalid password")
     
@@ -116,7 +112,7 @@ async def test_change_password_wrong_old_password(client):
          patch("extensions.keycloak.KeycloakOpenID.a_token", new_callable=AsyncMock, side_effect=mock_token_error):
         response = await client.put(
             "/api/user/change-password",
-            headers={"Authorization": f"Bearer {fake_token}"},
+            headers=AUTH_HEADERS,
             json={"old_password": "wrongpw", "new_password": "newStrongPassword123"}
         )
         assert response.status_code == 401
\ No newline at end of file
@@ -1,4 +1,8 @@
 import pytest
+import asyncio
+from tests.helpers import read_json
+from unittest.mock import AsyncMock, MagicMock, patch
+from websocket.manager import ConnectionManager, Connection, BROADCAST_CHANNEL
 
 pytestmark = pytest.mark.asyncio
 
@@ -11,7 +15,7 @@ async def test_broadcast_api(client):
     payload = {"type": "test", "data": {"msg": "hello all"}}
     resp = await client.post("/api/websocket/broadcast", json=payload)
     assert resp.status_code == 200
-    assert resp.json()["code"] == 200
+    assert read_json(resp)["code"] == 200
 
 async def test_push_message_to_user_api(client):
     # Test pushing message to specific user
@@ -30,8 +34,107 @@ async def test_push_message_to_role_api(client):
 async def test_get_online_users(client):
     resp = await client.get("/api/websocket/online-users")
     assert resp.status_code == 200
-    data = resp.json()
+    data = read_json(resp)
     assert "code" in data and "data" in data
     assert "total_users" in data["data"]
     # Mock redis returns empty list, so total users should be 0
-    assert data["data"]["total_users"] == 0 
\ No newline at end of file
+    assert data["data"]["total_users"] == 0 
+
+
+class FakePubSub:
+    """
+    Minimal stand-in for a redis-py PubSub: replays the given messages,
+    then raises `error` if set, otherwise blocks like a live subscription.
+    """
+    def __init__(self, messages, error=None):
+        self.messages = messages
+        self.error = error
+        self.channels = []
+        self.closed = False
+
+    async def subscribe(self, *channels):
+        self.channels.extend(channels)
+
+    async def listen(self):
+        for msg in self.messages:
+            yield msg
+        if self.error:
+            raise self.error
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+def make_local_connection(manager, sid="sid-1"):
+    ws = AsyncMock()
+    manager.active_connections[sid] = Connection(
+        sid=sid,
+        user_id="user_001",
+        email="user@example.com",
+        ip="127.0.0.1",
+        connected_time="",
+        last_heartbeat="",
+        websocket=ws
+    )
+    return ws
+
+
+async def run_listener_until_sent(manager, ws):
+    task = asyncio.create_task(manager.listen_broadcasts())
+    try:
+        for _ in range(100):
+            if ws.send_text.await_count:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def test_broadcast_publishes_to_channel():
+    # broadcast publishes one frame for every worker instead of sending locally
+    manager = ConnectionManager()
+    ws = make_local_connection(manager)
+    redis = AsyncMock()
+    with patch("websocket.manager.get_redis", return_value=redis):
+        await manager.broadcast("notify", {"msg": "hello all"})
+    redis.publish.assert_awaited_once()
+    channel, frame = redis.publish.await_args.args
+    assert channel == BROADCAST_CHANNEL
+    assert '"type":"notify"' in frame
+    ws.send_text.assert_not_awaited()
+
+
+async def test_listen_broadcasts_delivers_to_local_connections():
+    # A published frame reaches the sockets held by this worker
+    manager = ConnectionManager()
+    ws = make_local_connection(manager)
+    frame = ConnectionManager.build_ws_message("notify", {"msg": "hello all"})
+    pubsub = FakePubSub([
+        {"type": "subscribe", "channel": BROADCAST_CHANNEL, "data": 1},
+        {"type": "message", "channel": BROADCAST_CHANNEL, "data": frame},
+    ])
+    redis = MagicMock()
+    redis.pubsub.return_value = pubsub
+    with patch("websocket.manager.get_redis", return_value=redis):
+        await run_listener_until_sent(manager, ws)
+    ws.send_text.assert_awaited_once_with(frame)
+    assert pubsub.channels == [BROADCAST_CHANNEL]
+    assert pubsub.closed
+
+
+async def test_listen_broadcasts_resubscribes_after_connection_loss():
+    # A dropped subscription is replaced instead of ending the listener
+    manager = ConnectionManager()
+    ws = make_local_connection(manager)
+    frame = ConnectionManager.build_ws_message("notify", {"msg": "after reconnect"})
+    lost = FakePubSub([], error=ConnectionError("Connection lost"))
+    restored = FakePubSub([{"type": "message", "channel": BROADCAST_CHANNEL, "data": frame}])
+    redis = MagicMock()
+    redis.pubsub.side_effect = [lost, restored]
+    with patch("websocket.manager.get_redis", return_value=redis), \
+         patch("websocket.manager.BROADCAST_RETRY_INITIAL_SECONDS", 0):
+        await run_listener_until_sent(manager, ws)
+    assert lost.closed
+    ws.send_text.assert_awaited_once_with(frame)
@@ -39,9 +39,8 @@ async def test_read_modbus_controller(test_db_session):
     
     test_db_session.add(controller)
     await test_db_session.commit()
-    await test_db_session.refresh(controller)
     
-    # Test query by ID
+    # Test query by ID (served from the identity map, not expired on commit)
     result = await test_db_session.get(ModbusController, controller.id)
     assert result is not None
     assert result.name == "Test Controller"
@@ -60,7 +59,6 @@ async def test_update_modbus_controller(test_db_session):
     
     test_db_session.add(controller)
     await test_db_session.commit()
-    await test_db_session.refresh(controller)
     
     # Update controller
     controller.name = "Updated Controller"
@@ -70,7 +68,6 @@ async def test_update_modbus_controller(test_db_session):
     controller.status = True
     
     await test_db_session.commit()
-    await test_db_session.refresh(controller)
     
     assert controller.name == "Updated Controller"
     assert controller.host == "192.168.1.200"
@@ -119,9 +116,11 @@ async def test_modbus_controller_repr(test_db_session):
     await test_db_session.refresh(controller)
     
     repr_str = repr(controller)
-    assert "ModbusController" in repr_str
-    assert controller.id in repr_str
-    assert controller.name in repr_str
-    assert controller.host in repr_str
-    assert str(controller.port) in repr_str
-    assert str(controller.status) in repr_str
\ No newline at end of file
+    assert all(fragment in repr_str for fragment in (
+        "ModbusController",
+        controller.id,
+        controller.name,
+        controller.host,
+        str(controller.port),
+        str(controller.status),
+    ))
\ No newline at end of file
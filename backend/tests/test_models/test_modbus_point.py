@@ -67,7 +67,6 @@ async def test_read_modbus_point(test_db_session):
     )
     test_db_session.add(controller)
     await test_db_session.commit()
-    await test_db_session.refresh(controller)
     
     # Create point
     point = ModbusPoint(
@@ -82,9 +81,8 @@ async def test_read_modbus_point(test_db_session):
     
     test_db_session.add(point)
     await test_db_session.commit()
-    await test_db_session.refresh(point)
     
-    # Test query by ID
+    # Test query by ID (served from the identity map, not expired on commit)
     result = await test_db_session.get(ModbusPoint, point.id)
     assert result is not None
     assert result.name == "Temperature Sensor"
@@ -103,7 +101,6 @@ async def test_update_modbus_point(test_db_session):
     )
     test_db_session.add(controller)
     await test_db_session.commit()
-    await test_db_session.refresh(controller)
     
     # Create point
     point = ModbusPoint(
@@ -118,7 +115,6 @@ async def test_update_modbus_point(test_db_session):
     
     test_db_session.add(point)
     await test_db_session.commit()
-    await test_db_session.refresh(point)
     
     # Update point
     point.name = "Updated Point"
@@ -129,7 +125,6 @@ async def test_update_modbus_point(test_db_session):
     point.max_value = 200.0
     
     await test_db_session.commit()
-    await test_db_session.refresh(point)
     
     assert point.name == "Updated Point"
     assert point.description == "Updated description"
@@ -209,12 +204,14 @@ async def test_modbus_point_repr(test_db_session):
     await test_db_session.refresh(point)
     
     repr_str = repr(point)
-    assert "ModbusPoint" in repr_str
-    assert point.id in repr_str
-    assert point.name in repr_str
-    assert point.type in repr_str
-    assert str(point.address) in repr_str
-    assert str(point.unit_id) in repr_str
+    assert all(fragment in repr_str for fragment in (
+        "ModbusPoint",
+        point.id,
+        point.name,
+        point.type,
+        str(point.address),
+        str(point.unit_id),
+    ))
 
 @pytest.mark.asyncio
 async def test_modbus_point_foreign_key_constraint(test_db_session):
@@ -1,181 +1,190 @@
+import time
 import logging
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from collections import Counter
+from typing import Optional, Dict, Any, Mapping
 
 logger = logging.getLogger(__name__)
 
+_LOG_LEVELS = {
+    "error": logging.ERROR,
+    "warning": logging.WARNING,
+    "info": logging.INFO,
+}
+
+# Shared read-only default for exceptions raised without details; pass a dict to attach details
+_EMPTY_DETAILS: Mapping[str, Any] = MappingProxyType({})
+
+# Repeated (error_code, message) pairs are only logged on the 1st, 2nd, 4th, 8th...
+# occurrence within a window, keeping log volume bounded under error storms
+_LOG_WINDOW_SECONDS = 60
+_log_counts: Counter = Counter()
+_log_window_start = 0.0
+
 class BaseServiceException(Exception):
+    # Per-instance state lives in slots, so the exception's __dict__ is never materialized
+    # unless a constructor argument overrides one of the class-level constants below
+    __slots__ = ("message", "details")
+
+    # Per-class constants; constructor arguments only override them for a single instance
+    error_code: str = None
     status_code: int = 500
     log_level: str = "error"
+    default_message: str = None
 
     def __init__(
         self, 
-        message: str, 
+        message: str = None, 
         error_code: str = None,
         details: Optional[Dict[str, Any]] = None,
         status_code: int = None,
         log_level: str = None
     ):
-        self.message = message
-        self.error_code = error_code
-        self.details = details or {}
+        self.message = message or self.default_message
+        self.details = details if details is not None else _EMPTY_DETAILS
+        if error_code is not None:
+            self.error_code = error_code
         if status_code is not None:
             self.status_code = status_code
         if log_level is not None:
             self.log_level = log_level
-        
-        log_msg = f"[{self.error_code}] | {self.message}"
-
-        if self.log_level == "error":
-            logger.error(log_msg)
-        elif self.log_level == "warning":
-            logger.warning(log_msg)
-        else:
-            logger.info(log_msg)
+        log_service_exception(self)
         super().__init__(self.message)
 
-class ServerException(BaseServiceException):
-    """Server exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Server error"
-        super().__init__(message, "SERVER_ERROR", details, status_code=500, log_level="error")
-
-class UserNotFoundException(BaseServiceException):
-    """User not found exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "User not found"
-        super().__init__(message, "USER_NOT_FOUND", details, status_code=404, log_level="warning")
-
-class EmailAlreadyExistsException(BaseServiceException):
-    """Email already exists exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Email already exists"
-        super().__init__(message, "EMAIL_ALREADY_EXISTS", details, status_code=409, log_level="warning")
-
-class InvalidPasswordException(BaseServiceException):
-    """Invalid password exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Invalid password"
-        super().__init__(message, "INVALID_PASSWORD", details, status_code=401, log_level="warning")
-
-class RoleNotFoundException(BaseServiceException):
-    """Role not found exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Role not found"
-        super().__init__(message, "ROLE_NOT_FOUND", details, status_code=404, log_level="warning")
-
-class RoleAlreadyExistsException(BaseServiceException):
-    """Role already exists exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Role already exists"
-        super().__init__(message, "ROLE_ALREADY_EXISTS", details, status_code=409, log_level="warning")
-
-class WebPushSubscriptionNotFoundException(BaseServiceException):
-    """Web push subscription not found exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Web push subscription not found"
-        super().__init__(message, "WEB_PUSH_SUBSCRIPTION_NOT_FOUND", details, status_code=404, log_level="warning")
-
-class ModbusConnectionException(BaseServiceException):
-    """Modbus connection failed exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Modbus connection failed"
-        super().__init__(message, "MODBUS_CONNECTION_FAILED", details, status_code=400, log_level="warning")
-
-class ModbusControllerNotFoundException(BaseServiceException):
-    """Modbus controller not found exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Modbus controller not found"
-        super().__init__(message, "MODBUS_CONTROLLER_NOT_FOUND", details, status_code=404, log_level="warning")
-
-class ModbusPointNotFoundException(BaseServiceException):
-    """Modbus point not found exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Modbus point not found"
-        super().__init__(message, "MODBUS_POINT_NOT_FOUND", details, status_code=404, log_level="warning")
-
-class ModbusReadException(BaseServiceException):
-    """Modbus read operation failed"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Modbus read operation failed"
-        super().__init__(message, "MODBUS_READ_FAILED", details, status_code=400, log_level="warning")
-
-
-class ModbusWriteException(BaseServiceException):
-    """Modbus write operation failed"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Modbus write operation failed"
-        super().__init__(message, "MODBUS_WRITE_FAILED", details, status_code=400, log_level="warning")
-
-
-class ModbusRangeValidationException(BaseServiceException):
-    """Modbus range validation failed"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Value is outside the valid range"
-        super().__init__(message, "MODBUS_RANGE_VALIDATION_FAILED", details, status_code=422, log_level="warning")
-
-
-class ModbusValidationException(BaseServiceException):
-    """Modbus validation failed exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Modbus validation failed"
-        super().__init__(message, "MODBUS_VALIDATION_FAILED", details, status_code=409, log_level="warning")
-
-class ModbusControllerDisconnectedException(BaseServiceException):
-    """Modbus controller is disconnected exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Modbus controller is disconnected"
-        super().__init__(message, "MODBUS_CONTROLLER_DISCONNECTED", details, status_code=400, log_level="warning")
-
-class ModbusConfigException(BaseServiceException):
-    """Modbus configuration exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Modbus configuration error"
-        super().__init__(message, "MODBUS_CONFIG_ERROR", details, status_code=400, log_level="error")
-
-class ModbusConfigFormatException(BaseServiceException):
-    """Modbus configuration format exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Configuration format error"
-        super().__init__(message, "MODBUS_CONFIG_FORMAT_ERROR", details, status_code=415, log_level="warning")
-
-class ModbusControllerDuplicateException(BaseServiceException):
-    """Modbus controller with same host and port already exists"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Controller with same host and port already exists"
-        super().__init__(message, "MODBUS_CONTROLLER_DUPLICATE", details, status_code=409, log_level="warning")
-
-class ModbusPointDuplicateException(BaseServiceException):
-    """Modbus point with same unit_id, address, and type already exists"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Point with same unit_id, address, and type already exists"
-        super().__init__(message, "MODBUS_POINT_DUPLICATE", details, status_code=409, log_level="warning")
-
-class SuperRoleOperationException(BaseServiceException):
-    """Super role operation not allowed exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "Super role operation not allowed"
-        super().__init__(message, "SUPER_ROLE_OPERATION_NOT_ALLOWED", details, status_code=403, log_level="warning")
-
-class FileNotFoundException(BaseServiceException):
-    """File not found exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "File not found"
-        super().__init__(message, "FILE_NOT_FOUND", details, status_code=404, log_level="warning")
-
-class FileUploadException(BaseServiceException):
-    """File upload exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "File upload failed"
-        super().__init__(message, "FILE_UPLOAD_FAILED", details, status_code=400, log_level="warning")
-
-class FileSizeExceedsLimitException(BaseServiceException):
-    """File size exceeds limit exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "File size exceeds limit"
-        super().__init__(message, "FILE_SIZE_EXCEEDS_LIMIT", details, status_code=413, log_level="warning")
-
-class FileFormatNotAllowedException(BaseServiceException):
-    """File format not allowed exception"""
-    def __init__(self, message: str = None, details: Dict[str, Any] = None):
-        message = f"{message}" if message else "File format not allowed"
-        super().__init__(message, "FILE_FORMAT_NOT_ALLOWED", details, status_code=415, log_level="warning")
\ No newline at end of file
+def log_service_exception(exc: BaseServiceException) -> None:
+    """Log a service exception where it is raised, rate-limited per (error_code, message)"""
+    global _log_window_start
+
+    level = _LOG_LEVELS.get(exc.log_level, logging.INFO)
+    if not logger.isEnabledFor(level):
+        return
+
+    now = time.monotonic()
+    if now - _log_window_start > _LOG_WINDOW_SECONDS:
+        _log_counts.clear()
+        _log_window_start = now
+
+    key = (exc.error_code, exc.message)
+    _log_counts[key] += 1
+    count = _log_counts[key]
+    if count & (count - 1):
+        return
+
+    # Deferred %-formatting: the string is only built if a handler accepts the record
+    if count == 1:
+        logger.log(level, "[%s] | %s", exc.error_code, exc.message)
+    else:
+        logger.log(level, "[%s] | %s (repeated %d times)", exc.error_code, exc.message, count)
+
+def _service_exception_init(self, message: str = None, details: Dict[str, Any] = None):
+    BaseServiceException.__init__(self, message, details=details)
+
+def _make_exception(name: str, error_code: str, status_code: int, log_level: str, default_message: str, doc: str):
+    """Build a BaseServiceException subclass with its error metadata frozen as class attributes"""
+    return type(name, (BaseServiceException,), {
+        "__slots__": (),
+        "__init__": _service_exception_init,
+        "__doc__": doc,
+        "__module__": __name__,
+        "error_code": error_code,
+        "status_code": status_code,
+        "log_level": log_level,
+        "default_message": default_message,
+    })
+
+ServerException = _make_exception(
+    "ServerException", "SERVER_ERROR", 500, "error",
+    "Server error", "Server exception"
+)
+UserNotFoundException = _make_exception(
+    "UserNotFoundException", "USER_NOT_FOUND", 404, "warning",
+    "User not found", "User not found exception"
+)
+EmailAlreadyExistsException = _make_exception(
+    "EmailAlreadyExistsException", "EMAIL_ALREADY_EXISTS", 409, "warning",
+    "Email already exists", "Email already exists exception"
+)
+InvalidPasswordException = _make_exception(
+    "InvalidPasswordException", "INVALID_PASSWORD", 401, "warning",
+    "Invalid password", "Invalid password exception"
+)
+RoleNotFoundException = _make_exception(
+    "RoleNotFoundException", "ROLE_NOT_FOUND", 404, "warning",
+    "Role not found", "Role not found exception"
+)
+RoleAlreadyExistsException = _make_exception(
+    "RoleAlreadyExistsException", "ROLE_ALREADY_EXISTS", 409, "warning",
+    "Role already exists", "Role already exists exception"
+)
+WebPushSubscriptionNotFoundException = _make_exception(
+    "WebPushSubscriptionNotFoundException", "WEB_PUSH_SUBSCRIPTION_NOT_FOUND", 404, "warning",
+    "Web push subscription not found", "Web push subscription not found exception"
+)
+ModbusConnectionException = _make_exception(
+    "ModbusConnectionException", "MODBUS_CONNECTION_FAILED", 400, "warning",
+    "Modbus connection failed", "Modbus connection failed exception"
+)
+ModbusControllerNotFoundException = _make_exception(
+    "ModbusControllerNotFoundException", "MODBUS_CONTROLLER_NOT_FOUND", 404, "warning",
+    "Modbus controller not found", "Modbus controller not found exception"
+)
+ModbusPointNotFoundException = _make_exception(
+    "ModbusPointNotFoundException", "MODBUS_POINT_NOT_FOUND", 404, "warning",
+    "Modbus point not found", "Modbus point not found exception"
+)
+ModbusReadException = _make_exception(
+    "ModbusReadException", "MODBUS_READ_FAILED", 400, "warning",
+    "Modbus read operation failed", "Modbus read operation failed"
+)
+ModbusWriteException = _make_exception(
+    "ModbusWriteException", "MODBUS_WRITE_FAILED", 400, "warning",
+    "Modbus write operation failed", "Modbus write operation failed"
+)
+ModbusRangeValidationException = _make_exception(
+    "ModbusRangeValidationException", "MODBUS_RANGE_VALIDATION_FAILED", 422, "warning",
+    "Value is outside the valid range", "Modbus range validation failed"
+)
+ModbusValidationException = _make_exception(
+    "ModbusValidationException", "MODBUS_VALIDATION_FAILED", 409, "warning",
+    "Modbus validation failed", "Modbus validation failed exception"
+)
+ModbusControllerDisconnectedException = _make_exception(
+    "ModbusControllerDisconnectedException", "MODBUS_CONTROLLER_DISCONNECTED", 400, "warning",
+    "Modbus controller is disconnected", "Modbus controller is disconnected exception"
+)
+ModbusConfigException = _make_exception(
+    "ModbusConfigException", "MODBUS_CONFIG_ERROR", 400, "error",
+    "Modbus configuration error", "Modbus configuration exception"
+)
+ModbusConfigFormatException = _make_exception(
+    "ModbusConfigFormatException", "MODBUS_CONFIG_FORMAT_ERROR", 415, "warning",
+    "Configuration format error", "Modbus configuration format exception"
+)
+ModbusControllerDuplicateException = _make_exception(
+    "ModbusControllerDuplicateException", "MODBUS_CONTROLLER_DUPLICATE", 409, "warning",
+    "Controller with same host and port already exists", "Modbus controller with same host and port already exists"
+)
+ModbusPointDuplicateException = _make_exception(
+    "ModbusPointDuplicateException", "MODBUS_POINT_DUPLICATE", 409, "warning",
+    "Point with same unit_id, address, and type already exists", "Modbus point with same unit_id, address, and type already exists"
+)
+SuperRoleOperationException = _make_exception(
+    "SuperRoleOperationException", "SUPER_ROLE_OPERATION_NOT_ALLOWED", 403, "warning",
+    "Super role operation not allowed", "Super role operation not allowed exception"
+)
+FileNotFoundException = _make_exception(
+    "FileNotFoundException", "FILE_NOT_FOUND", 404, "warning",
+    "File not found", "File not found exception"
+)
+FileUploadException = _make_exception(
+    "FileUploadException", "FILE_UPLOAD_FAILED", 400, "warning",
+    "File upload failed", "File upload exception"
+)
+FileSizeExceedsLimitException = _make_exception(
+    "FileSizeExceedsLimitException", "FILE_SIZE_EXCEEDS_LIMIT", 413, "warning",
+    "File size exceeds limit", "File size exceeds limit exception"
+)
+FileFormatNotAllowedException = _make_exception(
+    "FileFormatNotAllowedException", "FILE_FORMAT_NOT_ALLOWED", 415, "warning",
+    "File format not allowed", "File format not allowed exception"
+)
\ No newline at end of file
@@ -3,11 +3,21 @@ Async file I/O operations using aiofiles
 """
 import os
 import asyncio
+import fnmatch
 import aiofiles
+import aiofiles.os
 from pathlib import Path
-from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Union, AsyncIterable, AsyncIterator
 from utils.custom_exception import FileNotFoundException, FileUploadException
 
+# Upper bound for a single read/write so large files never sit in memory as one object
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Dedicated small pool for aiofiles, so large reads/writes don't queue behind
+# (or block) the default executor used by asyncio.to_thread elsewhere in the app
+_FILE_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="file-io")
+
 
 async def ensure_dir_exists(directory: Path) -> None:
     """Ensure directory exists"""
@@ -17,12 +27,18 @@ async def ensure_dir_exists(directory: Path) -> None:
         raise FileUploadException(f"Failed to create directory: {str(e)}")
 
 
-async def save_file(file_path: Path, content: bytes) -> None:
-    """Save file asynchronously"""
+async def save_file(file_path: Path, content: Union[bytes, AsyncIterable[bytes]]) -> None:
+    """Save file asynchronously in chunks, from bytes or an async byte stream"""
     try:
         await ensure_dir_exists(file_path.parent)
-        async with aiofiles.open(file_path, "wb") as f:
-            await f.write(content)
+        async with aiofiles.open(file_path, "wb", executor=_FILE_IO_POOL) as f:
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                view = memoryview(content)
+                for start in range(0, len(view), CHUNK_SIZE):
+                    await f.write(view[start:start + CHUNK_SIZE])
+            else:
+                async for chunk in content:
+                    await f.write(chunk)
     except FileUploadException:
         raise
     except Exception as e:
@@ -32,14 +48,26 @@ async def save_file(file_path: Path, content: bytes) -> None:
 async def load_file(file_path: Path) -> bytes:
     """Load file asynchronously"""
     try:
-        if not await check_file_exists(file_path):
-            raise FileNotFoundException(f"File not found: {file_path}")
-        
-        async with aiofiles.open(file_path, "rb") as f:
+        async with aiofiles.open(file_path, "rb", executor=_FILE_IO_POOL) as f:
             content = await f.read()
         return content
-    except FileNotFoundException:
-        raise
+    except FileNotFoundError:
+        raise FileNotFoundException(f"File not found: {file_path}")
+    except Exception as e:
+        raise FileUploadException(f"Failed to load file: {str(e)}")
+
+
+async def load_file_stream(file_path: Path) -> AsyncIterator[bytes]:
+    """
+    Load file asynchronously as a stream of chunks, e.g. for StreamingResponse.
+    To send a file unchanged, return FileResponse(file_path) instead so the server can use sendfile.
+    """
+    try:
+        async with aiofiles.open(file_path, "rb", executor=_FILE_IO_POOL) as f:
+            while chunk := await f.read(CHUNK_SIZE):
+                yield chunk
+    except FileNotFoundError:
+        raise FileNotFoundException(f"File not found: {file_path}")
     except Exception as e:
         raise FileUploadException(f"Failed to load file: {str(e)}")
 
@@ -47,30 +75,25 @@ async def load_file(file_path: Path) -> bytes:
 async def remove_file(file_path: Path) -> None:
     """Remove file asynchronously"""
     try:
-        if not await check_file_exists(file_path):
-            raise FileNotFoundException(f"File not found: {file_path}")
-        
         await asyncio.to_thread(os.remove, file_path)
-    except FileNotFoundException:
-        raise
+    except FileNotFoundError:
+        raise FileNotFoundException(f"File not found: {file_path}")
     except Exception as e:
         raise FileUploadException(f"Failed to remove file: {str(e)}")
 
 
 async def check_file_exists(file_path: Path) -> bool:
     """Check if file exists"""
-    return await asyncio.to_thread(file_path.exists)
+    # stat can block on slow or network filesystems, so keep it off the event loop
+    return await aiofiles.os.path.exists(file_path, executor=_FILE_IO_POOL)
 
 
 async def get_file_info(file_path: Path) -> os.stat_result:
     """Get file stat info"""
     try:
-        if not await check_file_exists(file_path):
-            raise FileNotFoundException(f"File not found: {file_path}")
-        
-        return await asyncio.to_thread(file_path.stat)
-    except FileNotFoundException:
-        raise
+        return await asyncio.to_thread(os.stat, file_path)
+    except FileNotFoundError:
+        raise FileNotFoundException(f"File not found: {file_path}")
     except Exception as e:
         raise FileUploadException(f"Failed to get file info: {str(e)}")
 
@@ -81,20 +104,17 @@ async def get_files_in_dir(
 ) -> List[Path]:
     """List files in directory"""
     try:
-        if not await check_file_exists(directory):
-            return []
-        
         def _list_files_sync():
-            files = []
-            if pattern:
-                for file_path in directory.glob(pattern):
-                    if file_path.is_file():
-                        files.append(file_path)
-            else:
-                for file_path in directory.iterdir():
-                    if file_path.is_file():
-                        files.append(file_path)
-            return files
+            # DirEntry.is_file() is answered from the directory read, without an extra stat per entry
+            try:
+                with os.scandir(directory) as entries:
+                    return [
+                        Path(entry.path) for entry in entries
+                        if entry.is_file()
+                        and (not pattern or fnmatch.fnmatch(entry.name, pattern))
+                    ]
+            except FileNotFoundError:
+                return []
         
         return await asyncio.to_thread(_list_files_sync)
     except Exception as e:
@@ -107,11 +127,18 @@ async def search_file_by_prefix(
 ) -> Optional[Path]:
     """Find file by name prefix"""
     try:
-        files = await get_files_in_dir(directory)
-        for file_path in files:
-            if file_path.name.startswith(prefix):
-                return file_path
-        return None
+        def _find_file_sync():
+            # Stop at the first match instead of materializing the whole listing
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(prefix) and entry.is_file():
+                            return Path(entry.path)
+            except FileNotFoundError:
+                pass
+            return None
+        
+        return await asyncio.to_thread(_find_file_sync)
     except Exception as e:
         raise FileUploadException(f"Failed to search file: {str(e)}")
 
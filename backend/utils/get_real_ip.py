@@ -1,13 +1,67 @@
+import ipaddress
 from fastapi import Request
 
-def get_real_ip(request: Request) -> str:
+def _is_valid_ip(ip: str) -> bool:
+    """Validate an IP string, checking dotted IPv4 inline and only using ipaddress for IPv6"""
+    parts = ip.split(".")
+    if len(parts) == 4 and all(
+        part.isascii() and part.isdigit() and len(part) <= 3 and int(part) <= 255
+        for part in parts
+    ):
+        return True
+    if ":" in ip:
+        try:
+            ipaddress.IPv6Address(ip)
+            return True
+        except ValueError:
+            return False
+    return False
+
+def _real_ip(headers, client) -> str:
     """
-    Get the real client IP address, prioritizing proxy headers
+    Resolve the real client IP from request headers, prioritizing proxy headers
     
     Priority order:
     1. X-Forwarded-For (takes first IP, usually the original client)
     2. X-Real-IP (real IP set by nginx)
-    3. request.client.host (direct connection IP)
+    3. client.host (direct connection IP)
+    
+    Header values that are not a valid IP address are skipped.
+    """
+    # Scan the raw header list once for both proxy headers, staying on bytes.
+    # A valid X-Forwarded-For wins, so return as soon as one is seen; an
+    # invalid one is ignored rather than trusted and X-Real-IP is used instead.
+    seen_forwarded_for = False
+    real_ip = None
+    for key, value in headers.raw:
+        if key == b"x-forwarded-for" and not seen_forwarded_for:
+            seen_forwarded_for = True
+            # partition stops at the first comma without building a list
+            ip = value.partition(b",")[0].strip().decode("latin-1")
+            if _is_valid_ip(ip):
+                return ip
+        elif key == b"x-real-ip" and real_ip is None:
+            real_ip = value
+        else:
+            continue
+        if seen_forwarded_for and real_ip is not None:
+            break
+    
+    # Otherwise try X-Real-IP
+    if real_ip:
+        ip = real_ip.strip().decode("latin-1")
+        if _is_valid_ip(ip):
+            return ip
+    
+    # Fallback to direct connection IP
+    return client.host if client else "unknown"
+
+def get_real_ip(request: Request) -> str:
+    """
+    Get the real client IP address, prioritizing proxy headers
+    
+    The result is cached on request.state, so middlewares and dependencies
+    handling the same request only parse the headers once.
     
     Args:
         request: FastAPI request object
@@ -15,43 +69,20 @@ def get_real_ip(request: Request) -> str:
     Returns:
         str: Real client IP address
     """
-    # First try X-Forwarded-For
-    forwarded_for = request.headers.get("x-forwarded-for")
-    if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
-    
-    # Then try X-Real-IP
-    real_ip = request.headers.get("x-real-ip")
-    if real_ip:
-        return real_ip.strip()
-    
-    # Fallback to direct connection IP
-    return request.client.host if request.client else "unknown"
+    real_ip = getattr(request.state, "real_ip", None)
+    if real_ip is None:
+        real_ip = _real_ip(request.headers, request.client)
+        request.state.real_ip = real_ip
+    return real_ip
 
 def get_real_ip_websocket(websocket) -> str:
     """
     Get the real client IP address from WebSocket connection
     
-    Priority order:
-    1. X-Forwarded-For (takes first IP, usually the original client)
-    2. X-Real-IP (real IP set by nginx)
-    3. websocket.client.host (direct connection IP)
-    
     Args:
         websocket: FastAPI WebSocket object
         
     Returns:
         str: Real client IP address
     """
-    # First try X-Forwarded-For
-    forwarded_for = websocket.headers.get("x-forwarded-for")
-    if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
-    
-    # Then try X-Real-IP
-    real_ip = websocket.headers.get("x-real-ip")
-    if real_ip:
-        return real_ip.strip()
-    
-    # Fallback to direct connection IP
-    return websocket.client.host if websocket.client else "unknown"
\ No newline at end of file
+    return _real_ip(websocket.headers, websocket.client)
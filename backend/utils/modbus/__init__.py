@@ -1,18 +1,31 @@
 """Modbus utilities package"""
-from .config_manager import ModbusConfigManager, export_modbus_config, import_modbus_config, ConfigFormat, ImportMode
-from .data_converter import ModbusDataConverter, ModbusDataType, ModbusPointType, ModbusFunctionCode
-from .validator import ModbusConfigValidator, ModbusConfigValidationResult
+import importlib
 
-__all__ = [
-    'ModbusConfigManager',
-    'export_modbus_config', 
-    'import_modbus_config',
-    'ConfigFormat',
-    'ImportMode',
-    'ModbusDataConverter',
-    'ModbusDataType',
-    'ModbusPointType',
-    'ModbusFunctionCode',
-    'ModbusConfigValidator',
-    'ModbusConfigValidationResult'
-]
\ No newline at end of file
+# Submodules are imported on first attribute access (PEP 562), so callers only pay for what they use
+_LAZY_ATTRS = {
+    'ModbusConfigManager': 'config_manager',
+    'export_modbus_config': 'config_manager',
+    'import_modbus_config': 'config_manager',
+    'ConfigFormat': 'config_manager',
+    'ImportMode': 'config_manager',
+    'ModbusDataConverter': 'data_converter',
+    'ModbusDataType': 'data_converter',
+    'ModbusPointType': 'data_converter',
+    'ModbusFunctionCode': 'data_converter',
+    'ModbusConfigValidator': 'validator',
+    'ModbusConfigValidationResult': 'validator',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,10 +1,16 @@
+import time
+import uuid
+import orjson
+import hashlib
 import logging
+from collections import OrderedDict
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
+from types import MappingProxyType
 from models.modbus_point import ModbusPoint
 from typing import Dict, List, Any, Optional
 from .validator import ModbusConfigValidator
-from sqlalchemy import select, delete, update
+from sqlalchemy import select, insert, delete, update, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from .data_converter import ModbusDataConverter
 from models.modbus_controller import ModbusController
@@ -17,6 +23,83 @@ from utils.custom_exception import (
 
 logger = logging.getLogger(__name__)
 
+# Rows per executemany INSERT; aiomysql folds each batch into one multi-row statement
+BULK_INSERT_BATCH_SIZE = 500
+
+# Read-only import defaults, shared by every manager call
+_DEFAULT_VALUES = MappingProxyType({
+    "timeout": 10,
+    "retries": 3,
+    "poll_period": 1000,
+    "len": 1,
+    "unit_id": 1,
+    "formula": None,
+    "unit": None,
+    "min_value": None,
+    "max_value": None,
+    "description": None,
+})
+# Bound once so per-point row building avoids repeated mapping lookups
+_DEFAULT_LEN = _DEFAULT_VALUES["len"]
+_DEFAULT_UNIT_ID = _DEFAULT_VALUES["unit_id"]
+
+# Fingerprints of recently validated payloads -> time they passed validation
+VALIDATION_CACHE_TTL_SECONDS = 300
+VALIDATION_CACHE_MAX_ENTRIES = 128
+_validated_configs: "OrderedDict[bytes, float]" = OrderedDict()
+
+def _config_fingerprint(config: Dict[str, Any], format: "ConfigFormat") -> Optional[bytes]:
+    """Hash a config payload and its format; None if it cannot be serialized"""
+    try:
+        payload = orjson.dumps(config, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        return None
+    return hashlib.blake2b(format.value.encode() + b"\0" + payload, digest_size=16).digest()
+
+def _recently_validated(fingerprint: Optional[bytes]) -> bool:
+    """Check whether a payload passed validation within the TTL"""
+    if fingerprint is None:
+        return False
+    validated_at = _validated_configs.get(fingerprint)
+    if validated_at is None:
+        return False
+    if time.monotonic() - validated_at > VALIDATION_CACHE_TTL_SECONDS:
+        del _validated_configs[fingerprint]
+        return False
+    _validated_configs.move_to_end(fingerprint)
+    return True
+
+def _mark_validated(fingerprint: Optional[bytes]) -> None:
+    """Remember a validated payload, evicting the least recently used"""
+    if fingerprint is None:
+        return
+    _validated_configs[fingerprint] = time.monotonic()
+    _validated_configs.move_to_end(fingerprint)
+    if len(_validated_configs) > VALIDATION_CACHE_MAX_ENTRIES:
+        _validated_configs.popitem(last=False)
+
+# Point columns read from import data, with their fallbacks
+_POINT_FIELD_DEFAULTS = (
+    ("name", "Imported Point"),
+    ("description", None),
+    ("type", None),
+    ("data_type", None),
+    ("address", None),
+    ("len", _DEFAULT_LEN),
+    ("formula", None),
+    ("unit", None),
+    ("min_value", None),
+    ("max_value", None),
+)
+
+def _point_row(point_data: Dict[str, Any], controller_id: str, unit_id: int) -> Dict[str, Any]:
+    """Build a modbus_point insert row with a client-side id"""
+    row = {field: point_data.get(field, default) for field, default in _POINT_FIELD_DEFAULTS}
+    row["id"] = str(uuid.uuid4())
+    row["controller_id"] = controller_id
+    row["unit_id"] = unit_id
+    return row
+
 class ConfigFormat(str, Enum):
     """Supported configuration formats"""
     NATIVE = "native"
@@ -32,32 +115,20 @@ class ImportMode(str, Enum):
 class ModbusConfigManager:
     """Centralized Modbus configuration management"""
     
-    def __init__(self):
-        self.default_values = {
-            "timeout": 10,
-            "retries": 3,
-            "poll_period": 1000,
-            "len": 1,
-            "unit_id": 1,
-            "formula": None,
-            "unit": None,
-            "min_value": None,
-            "max_value": None,
-            "description": None,
-        }
-    
     async def export_config(
         self, 
         controller_id: str, 
         db: AsyncSession, 
-        format: ConfigFormat = ConfigFormat.NATIVE
+        format: ConfigFormat = ConfigFormat.NATIVE,
+        controller: Optional[ModbusController] = None
     ) -> Dict[str, Any]:
-        """Export Modbus configuration"""
+        """Export Modbus configuration, reusing the controller when the caller already loaded it"""
         try:
             if not controller_id:
                 raise ModbusConfigException("Controller ID is required for export.")
 
-            controller = await self._get_controller(controller_id, db)
+            if controller is None:
+                controller = await self._get_controller(controller_id, db)
             points = await self._get_controller_points(controller_id, db)
             
             if format == ConfigFormat.NATIVE:
@@ -81,8 +152,11 @@ class ModbusConfigManager:
     ) -> Dict[str, Any]:
         """Import Modbus configuration"""
         try:
-            # Validate configuration
-            ModbusConfigValidator.validate_config(config, format.value)
+            # Validate configuration, unless this exact payload passed recently
+            fingerprint = _config_fingerprint(config, format)
+            if not _recently_validated(fingerprint):
+                ModbusConfigValidator.validate_config(config, format.value)
+                _mark_validated(fingerprint)
             
             if format == ConfigFormat.NATIVE:
                 return await self._process_native_import(config, db, import_mode)
@@ -100,7 +174,7 @@ class ModbusConfigManager:
         """Export in native format"""
         return {
             "format": "native",
-            "export_time": datetime.now().isoformat(),
+            "export_time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
             "controller": {
                 "name": controller.name,
                 "host": controller.host,
@@ -146,7 +220,7 @@ class ModbusConfigManager:
             "name": slave.get("deviceName", "Imported Controller"),
             "host": slave.get("host", "localhost"),
             "port": slave.get("port", 502),
-            "timeout": slave.get("timeout", self.default_values["timeout"])
+            "timeout": slave.get("timeout", _DEFAULT_VALUES["timeout"])
         }
         
         points_data = ModbusDataConverter.convert_thingsboard_to_unified_format(slave)
@@ -167,6 +241,16 @@ class ModbusConfigManager:
     ) -> Dict[str, Any]:
         """Unified import processing logic"""
         try:
+            # Skipping only needs to know the controller exists, not load it
+            if import_mode == ImportMode.SKIP_CONTROLLER:
+                if await self._controller_exists(controller_data, db):
+                    return self._create_controller_result(
+                        None, controller_data.get("name"), "skipped", "Controller already exists", []
+                    )
+                return await self._create_new_controller_with_points(
+                    controller_data, points_data, db
+                )
+            
             # Check for existing controller
             existing_controller = await self._find_existing_controller(controller_data, db)
             
@@ -190,13 +274,8 @@ class ModbusConfigManager:
         db: AsyncSession,
         import_mode: ImportMode
     ) -> Dict[str, Any]:
-        """Handle existing controller import"""
-        if import_mode == ImportMode.SKIP_CONTROLLER:
-            return self._create_controller_result(
-                None, controller_data.get("name"), "skipped", "Controller already exists", []
-            )
-        
-        elif import_mode == ImportMode.OVERWRITE_CONTROLLER:
+        """Handle existing controller import (SKIP_CONTROLLER is resolved in _process_import)"""
+        if import_mode == ImportMode.OVERWRITE_CONTROLLER:
             return await self._overwrite_controller_and_points(
                 existing_controller, controller_data, points_data, db
             )
@@ -221,8 +300,8 @@ class ModbusConfigManager:
             status=False
         )
         db.add(controller)
-        await db.commit()
-        await db.refresh(controller)
+        # Flush only (assigns the id default); controller and points are committed together below
+        await db.flush()
         
         point_results = await self._create_all_points(controller, points_data, db)
         await db.commit()
@@ -240,15 +319,9 @@ class ModbusConfigManager:
         db: AsyncSession
     ) -> Dict[str, Any]:
         """Overwrite controller and points"""
-        # Update controller
-        await db.execute(
-            update(ModbusController)
-            .where(ModbusController.id == existing_controller.id)
-            .values(
-                name=controller_data.get("name"),
-                timeout=controller_data.get("timeout", 10)
-            )
-        )
+        # Update controller in place; flushed by the unit of work on commit
+        existing_controller.name = controller_data.get("name")
+        existing_controller.timeout = controller_data.get("timeout", 10)
         
         # Delete existing points
         await db.execute(
@@ -274,11 +347,22 @@ class ModbusConfigManager:
         """Update controller points"""
         point_results = []
         
+        # Prefetch the controller's points once instead of probing per point
+        result = await db.execute(
+            select(ModbusPoint).where(ModbusPoint.controller_id == existing_controller.id)
+        )
+        existing_points = {
+            (point.unit_id, point.address, point.type): point
+            for point in result.scalars().all()
+        }
+        new_rows = {}
+        updated_rows = []
+        
         for point_data in points_data:
             try:
-                result = await self._process_single_point(
+                result = self._process_single_point(
                     point_data, existing_controller, 
-                    point_data.get("unit_id", 1), db, import_mode
+                    point_data.get("unit_id", _DEFAULT_UNIT_ID), existing_points, new_rows, updated_rows, import_mode
                 )
                 point_results.append(result)
             except Exception as e:
@@ -290,7 +374,13 @@ class ModbusConfigManager:
                     "message": "Point error"
                 })
         
-        await db.commit()
+        if updated_rows:
+            # Bulk UPDATE by primary key, sent as a single executemany
+            await db.execute(update(ModbusPoint), updated_rows)
+        if new_rows:
+            await db.execute(insert(ModbusPoint), list(new_rows.values()))
+        if updated_rows or new_rows:
+            await db.commit()
         
         return self._determine_controller_result_status(
             point_results, str(existing_controller.id), existing_controller.name,
@@ -303,48 +393,44 @@ class ModbusConfigManager:
         points_data: List[Dict[str, Any]],
         db: AsyncSession
     ) -> List[Dict[str, Any]]:
-        """Create all points"""
-        point_results = []
+        """Create all points with a single bulk INSERT"""
+        if not points_data:
+            return []
         
-        for point_data in points_data:
-            point = ModbusPoint(
-                controller_id=controller.id,
-                name=point_data.get("name"),
-                description=point_data.get("description"),
-                type=point_data.get("type"),
-                data_type=point_data.get("data_type"),
-                address=point_data.get("address"),
-                len=point_data.get("len", 1),
-                unit_id=point_data.get("unit_id", 1),
-                formula=point_data.get("formula"),
-                unit=point_data.get("unit"),
-                min_value=point_data.get("min_value"),
-                max_value=point_data.get("max_value")
-            )
-            db.add(point)
-            await db.flush()
-            
-            point_results.append({
-                "point_id": str(point.id),
-                "point_name": point.name,
+        rows = [
+            _point_row(point_data, controller.id, point_data.get("unit_id", _DEFAULT_UNIT_ID))
+            for point_data in points_data
+        ]
+        # Ids are generated client-side, so no RETURNING round-trip is needed
+        for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+            await db.execute(insert(ModbusPoint), rows[start:start + BULK_INSERT_BATCH_SIZE])
+        
+        return [
+            {
+                "point_id": row["id"],
+                "point_name": row["name"],
                 "status": "success",
                 "message": "Created successfully"
-            })
-        
-        return point_results
+            }
+            for row in rows
+        ]
     
-    async def _process_single_point(
+    def _process_single_point(
         self,
         point_data: Dict[str, Any],
         controller: ModbusController,
         unit_id: int,
-        db: AsyncSession,
+        existing_points: Dict[tuple, ModbusPoint],
+        new_rows: Dict[tuple, Dict[str, Any]],
+        updated_rows: List[Dict[str, Any]],
         import_mode: ImportMode
     ) -> Dict[str, Any]:
-        """Process single point"""
-        existing_point = await self._find_existing_point(controller, point_data, unit_id, db)
+        """Process single point against the prefetched points and pending inserts"""
+        key = (unit_id, point_data.get("address"), point_data.get("type"))
+        existing_point = existing_points.get(key)
+        pending_row = new_rows.get(key)
         
-        if existing_point:
+        if existing_point or pending_row:
             if import_mode == ImportMode.SKIP_DUPLICATES_POINT:
                 return {
                     "point_id": None,
@@ -352,10 +438,46 @@ class ModbusConfigManager:
                     "status": "skipped",
                     "message": "Point already exists"
                 }
-            else:  # OVERWRITE_DUPLICATES_POINT
-                return await self._update_existing_point(existing_point, point_data, db)
+            elif existing_point:  # OVERWRITE_DUPLICATES_POINT
+                updated_rows.append(self._update_existing_point(existing_point, point_data))
+                return {
+                    "point_id": str(existing_point.id),
+                    "point_name": point_data.get("name", "Imported Point"),
+                    "status": "success",
+                    "message": "Point updated successfully"
+                }
+            else:
+                # Duplicate within the same payload: the later entry wins
+                row = _point_row(point_data, controller.id, unit_id)
+                row["id"] = pending_row["id"]
+                new_rows[key] = row
+                return {
+                    "point_id": row["id"],
+                    "point_name": row["name"],
+                    "status": "success",
+                    "message": "Point updated successfully"
+                }
         else:
-            return await self._create_new_point(controller, point_data, unit_id, db)
+            row = _point_row(point_data, controller.id, unit_id)
+            new_rows[key] = row
+            return {
+                "point_id": row["id"],
+                "point_name": row["name"],
+                "status": "success",
+                "message": "Point created successfully"
+            }
+    
+    async def _controller_exists(self, controller_data: Dict[str, Any], db: AsyncSession) -> bool:
+        """Check whether a controller with the same host and port exists"""
+        result = await db.execute(
+            select(
+                exists().where(
+                    ModbusController.host == controller_data.get("host"),
+                    ModbusController.port == controller_data.get("port")
+                )
+            )
+        )
+        return result.scalar()
     
     async def _find_existing_controller(self, controller_data: Dict[str, Any], db: AsyncSession) -> Optional[ModbusController]:
         """Find existing controller"""
@@ -367,83 +489,22 @@ class ModbusConfigManager:
         )
         return result.scalar_one_or_none()
     
-    async def _find_existing_point(
-        self,
-        controller: ModbusController,
-        point_data: Dict[str, Any],
-        unit_id: int,
-        db: AsyncSession
-    ) -> Optional[ModbusPoint]:
-        """Find existing point"""
-        result = await db.execute(
-            select(ModbusPoint).where(
-                ModbusPoint.controller_id == controller.id,
-                ModbusPoint.unit_id == unit_id,
-                ModbusPoint.address == point_data.get("address"),
-                ModbusPoint.type == point_data.get("type")
-            )
-        )
-        return result.scalar_one_or_none()
-    
-    async def _update_existing_point(
+    def _update_existing_point(
         self,
         existing_point: ModbusPoint,
-        point_data: Dict[str, Any],
-        db: AsyncSession
+        point_data: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Update existing point"""
-        await db.execute(
-            update(ModbusPoint)
-            .where(ModbusPoint.id == existing_point.id)
-            .values(
-                name=point_data.get("name", "Imported Point"),
-                description=point_data.get("description"),
-                data_type=point_data.get("data_type"),
-                len=point_data.get("len", self.default_values["len"]),
-                formula=point_data.get("formula"),
-                unit=point_data.get("unit"),
-                min_value=point_data.get("min_value"),
-                max_value=point_data.get("max_value")
-            )
-        )
-        
-        return {
-            "point_id": str(existing_point.id),
-            "point_name": point_data.get("name", "Imported Point"),
-            "status": "success",
-            "message": "Point updated successfully"
-        }
-    
-    async def _create_new_point(
-        self,
-        controller: ModbusController,
-        point_data: Dict[str, Any],
-        unit_id: int,
-        db: AsyncSession
-    ) -> Dict[str, Any]:
-        """Create new point"""
-        point = ModbusPoint(
-            controller_id=controller.id,
-            name=point_data.get("name", "Imported Point"),
-            description=point_data.get("description"),
-            type=point_data.get("type"),
-            data_type=point_data.get("data_type"),
-            address=point_data.get("address"),
-            len=point_data.get("len", self.default_values["len"]),
-            unit_id=unit_id,
-            formula=point_data.get("formula"),
-            unit=point_data.get("unit"),
-            min_value=point_data.get("min_value"),
-            max_value=point_data.get("max_value")
-        )
-        db.add(point)
-        await db.flush()
-        
+        """Build the update row for an existing point"""
         return {
-            "point_id": str(point.id),
-            "point_name": point.name,
-            "status": "success",
-            "message": "Point created successfully"
+            "id": existing_point.id,
+            "name": point_data.get("name", "Imported Point"),
+            "description": point_data.get("description"),
+            "data_type": point_data.get("data_type"),
+            "len": point_data.get("len", _DEFAULT_LEN),
+            "formula": point_data.get("formula"),
+            "unit": point_data.get("unit"),
+            "min_value": point_data.get("min_value"),
+            "max_value": point_data.get("max_value")
         }
     
     async def _get_controller(self, controller_id: str, db: AsyncSession) -> ModbusController:
@@ -472,19 +533,25 @@ class ModbusConfigManager:
         failed_message: str
     ) -> Dict[str, Any]:
         """Determine controller result status based on point results"""
-        success_points = [p for p in point_results if p["status"] == "success"]
-        error_points = [p for p in point_results if p["status"] == "error"]
-        skipped_points = [p for p in point_results if p["status"] == "skipped"]
+        success_count = error_count = skipped_count = 0
+        for p in point_results:
+            status = p["status"]
+            if status == "success":
+                success_count += 1
+            elif status == "error":
+                error_count += 1
+            elif status == "skipped":
+                skipped_count += 1
         
-        if len(success_points) > 0:
+        if success_count > 0:
             return self._create_controller_result(
                 controller_id, controller_name, "success", success_message, point_results
             )
-        elif len(error_points) > 0 and len(success_points) == 0 and len(skipped_points) == 0:
+        elif error_count > 0 and skipped_count == 0:
             return self._create_controller_result(
                 controller_id, controller_name, "failed", "All points failed to import", point_results
             )
-        elif len(skipped_points) > 0 and len(success_points) == 0 and len(error_points) == 0:
+        elif skipped_count > 0 and error_count == 0:
             return self._create_controller_result(
                 controller_id, controller_name, "failed", "All points already exist", point_results
             )
@@ -513,15 +580,29 @@ class ModbusConfigManager:
             "points": points
         }
 
+# Plain lookups for request strings; a miss surfaces as a config error
+_FORMATS = {f.value: f for f in ConfigFormat}
+_IMPORT_MODES = {m.value: m for m in ImportMode}
+
+def _resolve_format(format: str) -> ConfigFormat:
+    """Resolve a format string to ConfigFormat"""
+    config_format = _FORMATS.get(format)
+    if config_format is None:
+        raise ModbusConfigFormatException(f"Unsupported format: {format}")
+    return config_format
+
+# The manager holds no per-request state, so one instance serves every call
+_MANAGER = ModbusConfigManager()
+
 # Convenience functions for backward compatibility
 async def export_modbus_config(
     controller_id: str, 
     db: AsyncSession, 
-    format: str = "native"
+    format: str = "native",
+    controller: Optional[ModbusController] = None
 ) -> Dict[str, Any]:
     """Export Modbus configuration"""
-    manager = ModbusConfigManager()
-    return await manager.export_config(controller_id, db, ConfigFormat(format))
+    return await _MANAGER.export_config(controller_id, db, _resolve_format(format), controller)
 
 async def import_modbus_config(
     config: Dict[str, Any], 
@@ -530,5 +611,7 @@ async def import_modbus_config(
     import_mode: str = "skip_controller"
 ) -> Dict[str, Any]:
     """Import Modbus configuration"""
-    manager = ModbusConfigManager()
-    return await manager.import_config(config, db, ConfigFormat(format), ImportMode(import_mode))
\ No newline at end of file
+    mode = _IMPORT_MODES.get(import_mode)
+    if mode is None:
+        raise ModbusConfigException(f"Unsupported import mode: {import_mode}")
+    return await _MANAGER.import_config(config, db, _resolve_format(format), mode)
\ No newline at end of file
@@ -1,8 +1,10 @@
 import logging
 from enum import Enum
-from datetime import datetime
+from itertools import chain
+from collections import defaultdict
+from datetime import datetime, timezone
 from models.modbus_point import ModbusPoint
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from models.modbus_controller import ModbusController
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,21 @@ class ModbusPointType(str, Enum):
     HOLDING_REGISTER = "holding_register"
     INPUT_REGISTER = "input_register"
 
+# Plain point-type strings for per-point checks on the export path
+_COIL = ModbusPointType.COIL.value
+_INPUT = ModbusPointType.INPUT.value
+_HOLDING_REGISTER = ModbusPointType.HOLDING_REGISTER.value
+_INPUT_REGISTER = ModbusPointType.INPUT_REGISTER.value
+# ThingsBoard section each exported point type is listed under
+_EXPORT_SECTION = {
+    _COIL: "attributes",
+    _INPUT: "attributes",
+    _HOLDING_REGISTER: "timeseries",
+    _INPUT_REGISTER: "timeseries",
+}
+# Exported points are always described as raw bytes
+_TB_EXPORT_TYPE = "bytes"
+
 class ModbusFunctionCode(int, Enum):
     """Modbus function codes"""
     READ_COILS = 1
@@ -71,6 +88,10 @@ class ModbusDataConverter:
         }
     }
     
+    # Flat per-direction views of TYPE_TO_FUNCTION_CODE; read-only types have no write entry
+    _READ_FUNCTION_CODE = {pt.value: codes["read"] for pt, codes in TYPE_TO_FUNCTION_CODE.items()}
+    _WRITE_FUNCTION_CODE = {pt.value: codes["write"] for pt, codes in TYPE_TO_FUNCTION_CODE.items() if codes["write"]}
+    
     # ThingsBoard data type to system data type mapping
     TB_TYPE_TO_DATA_TYPE = {
         "bits": ModbusDataType.BOOL,
@@ -84,6 +105,23 @@ class ModbusDataConverter:
         "string": ModbusDataType.STRING,
     }
     
+    # Plain int/str tables for the per-item import path, so lookups skip enum hashing
+    _FC_TO_TYPE = {int(fc): pt.value for fc, pt in FUNCTION_CODE_TO_TYPE.items()}
+    _TB_TYPE_TO_DATA_TYPE = {tb_type: dt.value for tb_type, dt in TB_TYPE_TO_DATA_TYPE.items()}
+    
+    # Preference when merged items disagree: any 32/64-bit type, then int16, then uint16.
+    # bool and string never override the uint16 default.
+    _DATA_TYPE_RANK = {
+        ModbusDataType.BOOL.value: -1,
+        ModbusDataType.STRING.value: -1,
+        ModbusDataType.UINT16.value: 0,
+        ModbusDataType.INT16.value: 1,
+        ModbusDataType.INT32.value: 2,
+        ModbusDataType.UINT32.value: 2,
+        ModbusDataType.FLOAT32.value: 2,
+        ModbusDataType.FLOAT64.value: 2,
+    }
+    
     # System data type to ThingsBoard type mapping
     DATA_TYPE_TO_TB_TYPE = {
         ModbusDataType.BOOL: "bits",
@@ -99,72 +137,31 @@ class ModbusDataConverter:
     @classmethod
     def convert_thingsboard_to_unified_format(cls, slave: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Convert ThingsBoard format to unified internal format"""
-        points_data = []
         unit_id = slave.get("unitId", 1)
         
-        # Collect all points from different sections and deduplicate by address, unit_id, and type
+        # Collect all points from every section in one pass and deduplicate by address, unit_id, and type
         all_points = {}
+        items = chain(
+            (("attribute", attr) for attr in slave.get("attributes", ())),
+            (("timeseries", ts) for ts in slave.get("timeseries", ())),
+            (("rpc", rpc) for rpc in slave.get("rpc", ())),
+        )
+        for section, item in items:
+            point_info = all_points.setdefault(
+                cls._create_point_key(item, unit_id), {"sections": [], "items": []}
+            )
+            point_info["sections"].append(section)
+            point_info["items"].append(item)
         
-        # Process attributes (coils and discrete inputs)
-        for attr in slave.get("attributes", []):
-            point_key = cls._create_point_key(attr, unit_id)
-            if point_key not in all_points:
-                all_points[point_key] = {
-                    "data": attr,
-                    "sections": ["attribute"],
-                    "items": [attr]
-                }
-            else:
-                all_points[point_key]["sections"].append("attribute")
-                all_points[point_key]["items"].append(attr)
-        
-        # Process timeseries (holding registers and input registers)
-        for ts in slave.get("timeseries", []):
-            point_key = cls._create_point_key(ts, unit_id)
-            if point_key not in all_points:
-                all_points[point_key] = {
-                    "data": ts,
-                    "sections": ["timeseries"],
-                    "items": [ts]
-                }
-            else:
-                all_points[point_key]["sections"].append("timeseries")
-                all_points[point_key]["items"].append(ts)
-        
-        # Process RPC (writable points)
-        for rpc in slave.get("rpc", []):
-            point_key = cls._create_point_key(rpc, unit_id)
-            if point_key not in all_points:
-                all_points[point_key] = {
-                    "data": rpc,
-                    "sections": ["rpc"],
-                    "items": [rpc]
-                }
-            else:
-                all_points[point_key]["sections"].append("rpc")
-                all_points[point_key]["items"].append(rpc)
-        
-        # Convert each unique point
-        for point_key, point_info in all_points.items():
-            point_data = cls._convert_thingsboard_item_merged(point_info, unit_id)
-            if point_data:
-                points_data.append(point_data)
-        
-        return points_data
+        # Convert each unique point, dropping unsupported ones
+        converted = (cls._convert_thingsboard_item_merged(point_info, unit_id) for point_info in all_points.values())
+        return [point_data for point_data in converted if point_data]
 
     @classmethod
-    def _create_point_key(cls, item: Dict[str, Any], unit_id: int) -> str:
+    def _create_point_key(cls, item: Dict[str, Any], unit_id: int) -> Tuple[Any, int, Optional[str]]:
         """Create a unique key for a point based on address, unit_id, and type"""
-        function_code = item.get("functionCode")
-        point_type = cls._get_point_type_from_function_code(function_code)
-        address = item.get("address", 0)
-        
-        # For holding registers, both read (function code 3) and write (function code 6) 
-        # should be merged into the same point
-        if point_type == ModbusPointType.HOLDING_REGISTER:
-            point_type = ModbusPointType.HOLDING_REGISTER
-        
-        return f"{address}_{unit_id}_{point_type}"
+        # Read and write holding-register items map to the same type, so they merge into one point
+        return (item.get("address", 0), unit_id, cls._FC_TO_TYPE.get(item.get("functionCode")))
 
     @classmethod
     def _convert_thingsboard_item_merged(cls, point_info: Dict[str, Any], unit_id: int) -> Optional[Dict[str, Any]]:
@@ -182,33 +179,28 @@ class ModbusDataConverter:
                 logger.warning(f"Unsupported function code {function_code} for item {base_item.get('tag', 'unknown')}")
                 return None
             
-            # Determine the best name for the merged point
-            # Prefer timeseries name, then rpc name, then attribute name
-            name = base_item.get("tag", "Imported Point")
-            for item in items:
-                if "timeseries" in sections and item.get("tag"):
-                    name = item.get("tag")
-                    break
-                elif "rpc" in sections and item.get("tag"):
-                    name = item.get("tag")
-                    break
-            
-            # Determine data type from all items (prefer more specific types)
-            data_type = ModbusDataType.UINT16  # default
-            for item in items:
-                item_type = cls.TB_TYPE_TO_DATA_TYPE.get(item.get("type", "uint16"), ModbusDataType.UINT16)
-                # Prefer more specific types (e.g., float32 over uint16)
-                if item_type in [ModbusDataType.FLOAT32, ModbusDataType.FLOAT64, ModbusDataType.INT32, ModbusDataType.UINT32]:
-                    data_type = item_type
-                    break
-                elif item_type in [ModbusDataType.INT16, ModbusDataType.UINT16] and data_type == ModbusDataType.UINT16:
-                    data_type = item_type
-            
-            # Determine length from all items (use maximum length)
+            # Single pass over the merged items:
+            # - name: first tagged item when the point has a timeseries or rpc entry, else the base tag
+            # - data type: highest-ranked type, first one wins on ties (uint16 default)
+            # - length: maximum objectsCount
+            prefer_tagged = "timeseries" in sections or "rpc" in sections
+            name = None
+            data_type = ModbusDataType.UINT16.value
+            best_rank = cls._DATA_TYPE_RANK[data_type]
             max_len = 1
             for item in items:
-                item_len = item.get("objectsCount", 1)
-                max_len = max(max_len, item_len)
+                if name is None and prefer_tagged:
+                    name = item.get("tag") or None
+                
+                item_type = cls._TB_TYPE_TO_DATA_TYPE.get(item.get("type", "uint16"), ModbusDataType.UINT16.value)
+                rank = cls._DATA_TYPE_RANK[item_type]
+                if rank > best_rank:
+                    data_type, best_rank = item_type, rank
+                
+                max_len = max(max_len, item.get("objectsCount", 1))
+            
+            if name is None:
+                name = base_item.get("tag", "Imported Point")
             
             return {
                 "name": name,
@@ -232,18 +224,15 @@ class ModbusDataConverter:
     @classmethod
     def _get_point_type_from_function_code(cls, function_code: int) -> Optional[str]:
         """Get point type from function code"""
-        return cls.FUNCTION_CODE_TO_TYPE.get(function_code, None)
+        return cls._FC_TO_TYPE.get(function_code)
     
     @classmethod
     def convert_points_to_thingsboard_format(cls, controller: ModbusController, points: List[ModbusPoint]) -> Dict[str, Any]:
         """Convert points to ThingsBoard format"""
         # Group points by unit_id
-        points_by_unit = {}
+        points_by_unit = defaultdict(list)
         for point in points:
-            unit_id = point.unit_id
-            if unit_id not in points_by_unit:
-                points_by_unit[unit_id] = []
-            points_by_unit[unit_id].append(point)
+            points_by_unit[point.unit_id].append(point)
         
         slaves = []
         for unit_id, unit_points in points_by_unit.items():
@@ -253,7 +242,7 @@ class ModbusDataConverter:
         
         return {
             "master": {"slaves": slaves},
-            "export_time": datetime.now().isoformat(),
+            "export_time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
             "format": "thingsboard"
         }
     
@@ -280,44 +269,36 @@ class ModbusDataConverter:
     def _add_points_to_thingsboard_slave(cls, slave: Dict[str, Any], points: List[ModbusPoint]):
         """Add points to ThingsBoard slave configuration"""
         for point in points:
-            tb_type = "bytes"
-            read_function_code = cls.TYPE_TO_FUNCTION_CODE[point.type]["read"]
-            write_function_code = cls.TYPE_TO_FUNCTION_CODE[point.type]["write"]
+            point_type = point.type
             
-            point_config = {
-                "tag": point.name,
-                "type": tb_type,
-                "functionCode": read_function_code,
-                "objectsCount": point.len,
-                "address": point.address
-            }
-            
-            # Determine which section to place based on point type
-            if point.type in [ModbusPointType.COIL, ModbusPointType.INPUT]:
-                slave["attributes"].append(point_config)
-            elif point.type in [ModbusPointType.HOLDING_REGISTER, ModbusPointType.INPUT_REGISTER]:
-                slave["timeseries"].append(point_config)
+            # Build the read entry only for types that map to a section
+            section = _EXPORT_SECTION.get(point_type)
+            if section:
+                slave[section].append({
+                    "tag": point.name,
+                    "type": _TB_EXPORT_TYPE,
+                    "functionCode": cls._READ_FUNCTION_CODE[point_type],
+                    "objectsCount": point.len,
+                    "address": point.address
+                })
             
             # Add RPC configuration for writable points
+            write_function_code = cls._WRITE_FUNCTION_CODE.get(point_type)
             if write_function_code:
                 rpc_config = {
                     "tag": f"set_{point.name}",
-                    "type": tb_type,
+                    "type": _TB_EXPORT_TYPE,
                     "functionCode": write_function_code,
                     "address": point.address
                 }
-                if point.type == ModbusPointType.HOLDING_REGISTER:
+                if point_type == _HOLDING_REGISTER:
                     rpc_config["objectsCount"] = point.len
                 slave["rpc"].append(rpc_config)
     
     @classmethod
     def calculate_total_points_from_thingsboard(cls, slave: Dict[str, Any]) -> int:
         """Calculate total unique points from ThingsBoard slave configuration"""
-        all_point_tags = set()
-        for attr in slave.get("attributes", []):
-            all_point_tags.add(attr.get("tag"))
-        for ts in slave.get("timeseries", []):
-            all_point_tags.add(ts.get("tag"))
-        for rpc in slave.get("rpc", []):
-            all_point_tags.add(rpc.get("tag"))
-        return len(all_point_tags)
\ No newline at end of file
+        return len({
+            item.get("tag")
+            for item in chain(slave.get("attributes", ()), slave.get("timeseries", ()), slave.get("rpc", ()))
+        })
\ No newline at end of file
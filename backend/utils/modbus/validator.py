@@ -1,11 +1,22 @@
 import logging
+from operator import itemgetter
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .data_converter import ModbusPointType
 from utils.custom_exception import ModbusConfigFormatException
 
 logger = logging.getLogger(__name__)
 
+# Precomputed once at import instead of on every validation call
+_VALID_POINT_TYPES = frozenset(t.value for t in ModbusPointType)
+# Required keys, in the order they are reported when missing
+_CONTROLLER_REQUIRED_FIELDS = ("name", "host", "port")
+_POINT_REQUIRED_FIELDS = ("name", "type", "data_type", "address")
+_SLAVE_REQUIRED_FIELDS = ("host", "port", "deviceName")
+# itemgetter raises KeyError naming the first missing field, in declaration order
+_slave_item_required = itemgetter("tag", "functionCode", "address")
+_SLAVE_SECTIONS = ("attributes", "timeseries", "rpc")
+
 @dataclass
 class ModbusConfigValidationResult:
     """Configuration validation result"""
@@ -22,33 +33,26 @@ class ModbusConfigValidator:
         errors = []
         warnings = []
         
-        # Check for ThingsBoard format indicators
-        if "master" in config and "slaves" in config.get("master", {}):
-            raise ModbusConfigFormatException(
-                "Configuration appears to be in ThingsBoard format, but native format was expected. "
-                "Please select 'thingsboard' format for this file."
-            )
-        
         # Validate required sections
         if "controller" not in config or "points" not in config:
             raise ModbusConfigFormatException("Missing 'controller' and 'points' sections in native format")
         
         # Validate controller fields
         controller = config["controller"]
-        required_fields = ["name", "host", "port"]
-        for field in required_fields:
-            if field not in controller:
-                raise ModbusConfigFormatException(f"Missing required field '{field}' in controller")
+        if not isinstance(controller, dict):
+            raise ModbusConfigFormatException("Controller must be an object")
+        if field := _missing_field(_CONTROLLER_REQUIRED_FIELDS, controller):
+            raise ModbusConfigFormatException(f"Missing required field '{field}' in controller")
         
         # Validate points
         for i, point in enumerate(config["points"]):
-            required_fields = ["name", "type", "data_type", "address"]
-            for field in required_fields:
-                if field not in point:
-                    raise ModbusConfigFormatException(f"Point {i}: Missing required field '{field}'")
+            if not isinstance(point, dict):
+                raise ModbusConfigFormatException(f"Point {i}: Must be an object")
+            if field := _missing_field(_POINT_REQUIRED_FIELDS, point):
+                raise ModbusConfigFormatException(f"Point {i}: Missing required field '{field}'")
             
             # Validate point type
-            if "type" in point and point["type"] not in [t.value for t in ModbusPointType]:
+            if point["type"] not in _VALID_POINT_TYPES:
                 raise ModbusConfigFormatException(f"Point {i}: Invalid type '{point['type']}'")
         
         return ModbusConfigValidationResult(is_valid=True, errors=errors, warnings=warnings)
@@ -59,13 +63,6 @@ class ModbusConfigValidator:
         errors = []
         warnings = []
         
-        # Check for native format indicators
-        if "controller" in config and "points" in config:
-            raise ModbusConfigFormatException(
-                "Configuration appears to be in native format, but ThingsBoard format was expected. "
-                "Please select 'native' format for this file."
-            )
-        
         # Validate required sections
         if "master" not in config:
             raise ModbusConfigFormatException("Missing 'master' section in ThingsBoard format")
@@ -82,30 +79,66 @@ class ModbusConfigValidator:
         
         # Validate slave configuration
         for i, slave in enumerate(slaves):
-            required_fields = ["host", "port", "deviceName"]
-            for field in required_fields:
-                if field not in slave:
-                    raise ModbusConfigFormatException(f"Slave {i}: Missing required field '{field}'")
+            if not isinstance(slave, dict):
+                raise ModbusConfigFormatException(f"Slave {i}: Must be an object")
+            if field := _missing_field(_SLAVE_REQUIRED_FIELDS, slave):
+                raise ModbusConfigFormatException(f"Slave {i}: Missing required field '{field}'")
             
             # Validate attributes, timeseries, and rpc
-            for section in ["attributes", "timeseries", "rpc"]:
+            for section in _SLAVE_SECTIONS:
                 if section in slave:
                     for j, item in enumerate(slave[section]):
-                        if "tag" not in item:
-                            raise ModbusConfigFormatException(f"Slave {i} {section} {j}: Missing 'tag' field")
-                        if "functionCode" not in item:
-                            raise ModbusConfigFormatException(f"Slave {i} {section} {j}: Missing 'functionCode' field")
-                        if "address" not in item:
-                            raise ModbusConfigFormatException(f"Slave {i} {section} {j}: Missing 'address' field")
+                        # itemgetter only reports missing keys on dicts
+                        if not isinstance(item, dict):
+                            raise ModbusConfigFormatException(f"Slave {i} {section} {j}: Must be an object")
+                        try:
+                            _slave_item_required(item)
+                        except KeyError as e:
+                            raise ModbusConfigFormatException(f"Slave {i} {section} {j}: Missing '{e.args[0]}' field") from e
         
         return ModbusConfigValidationResult(is_valid=True, errors=errors, warnings=warnings)
     
     @classmethod
     def validate_config(cls, config: Dict[str, Any], format: str) -> ModbusConfigValidationResult:
         """Validate configuration based on format"""
-        if format == "native":
-            return cls.validate_native_format(config)
-        elif format == "thingsboard":
-            return cls.validate_thingsboard_format(config)
-        else:
-            raise ModbusConfigFormatException(f"Unsupported format: {format}")
\ No newline at end of file
+        validator = _FORMAT_VALIDATORS.get(format)
+        if validator is None:
+            raise ModbusConfigFormatException(f"Unsupported format: {format}")
+        
+        # Cheap top-level check for a file exported in the other format
+        if format == "native" and _looks_thingsboard(config):
+            raise ModbusConfigFormatException(
+                "Configuration appears to be in ThingsBoard format, but native format was expected. "
+                "Please select 'thingsboard' format for this file."
+            )
+        if format == "thingsboard" and _looks_native(config):
+            raise ModbusConfigFormatException(
+                "Configuration appears to be in native format, but ThingsBoard format was expected. "
+                "Please select 'native' format for this file."
+            )
+        
+        return validator(config)
+
+
+def _missing_field(fields: tuple, value: Dict[str, Any]) -> Optional[str]:
+    """Return the first required field absent from value, in declaration order"""
+    for field in fields:
+        if field not in value:
+            return field
+    return None
+
+
+def _looks_thingsboard(config: Dict[str, Any]) -> bool:
+    """Check the top-level keys of a ThingsBoard export"""
+    return "master" in config and "slaves" in config.get("master", {})
+
+
+def _looks_native(config: Dict[str, Any]) -> bool:
+    """Check the top-level keys of a native export"""
+    return "controller" in config and "points" in config
+
+
+_FORMAT_VALIDATORS = {
+    "native": ModbusConfigValidator.validate_native_format,
+    "thingsboard": ModbusConfigValidator.validate_thingsboard_format,
+}
\ No newline at end of file
@@ -1,4 +1,5 @@
 from datetime import datetime
+from functools import lru_cache
 from pydantic import BaseModel, RootModel
 from typing import Optional, Type, TypeVar, Generic
 
@@ -34,25 +35,22 @@ def parse_responses(custom: dict, default: dict = None) -> dict:
     - string: description only - creates simple error response
     """
     # Merge default responses first, then override with custom ones
-    merged = {}
+    result = {}
     if default:
-        merged.update(default)
+        # common_responses is used by nearly every route, so it is compiled once at import
+        result.update(_COMMON_RESPONSE_DOCS if default is common_responses else _compile_responses(default))
     if custom:
-        merged.update(custom)
+        result.update(_compile_responses(custom))
+    return result
 
+def _compile_responses(responses: dict) -> dict:
+    """Expand response shorthands into OpenAPI response docs"""
     result = {}
-    for code, val in merged.items():
+    for code, val in responses.items():
         if isinstance(val, tuple):
             if len(val) == 2:
                 desc, model = val
-                if model is None:
-                    data_example = None
-                else:
-                    try:
-                        schema = model.model_json_schema()
-                        data_example = generate_example_from_schema(schema)
-                    except:
-                        data_example = None
+                data_example = None if model is None else _example_for_model(model)
                 
                 example = {"code": code, "message": desc, "data": data_example}
                 result[code] = make_response_doc(desc, model, example)
@@ -71,82 +69,121 @@ def parse_responses(custom: dict, default: dict = None) -> dict:
             result[code] = val
     return result
 
-def generate_example_from_schema(schema: dict) -> dict:
-    """Generate example data from JSON schema object properties"""
-    if schema.get("type") == "object":
-        properties = schema.get("properties", {})
-        example = {}
-        for key, prop in properties.items():
-            example[key] = generate_property_example(prop, key, schema)
-        return example
-    return None
-
-def generate_property_example(prop: dict, key: str = "", full_schema: dict = None):
+@lru_cache(maxsize=None)
+def _example_for_model(model: Type) -> Optional[dict]:
+    """Build the data example for a model once; models shared across routes reuse it"""
+    try:
+        return generate_example_from_schema(model.model_json_schema())
+    except:
+        return None
+
+def generate_example_from_schema(schema: dict, memo: Optional[dict] = None) -> dict:
+    """
+    Generate example data from JSON schema object properties.
+    memo maps id(subschema) -> example for one generation run, so shared
+    $defs are expanded once and self-referencing models terminate.
+    """
+    if schema.get("type") != "object":
+        return None
+    if memo is None:
+        memo = {}
+    schema_id = id(schema)
+    if schema_id in memo:
+        return memo[schema_id]
+    # Placeholder while this schema is being expanded breaks reference cycles
+    memo[schema_id] = None
+    example = {
+        key: generate_property_example(prop, key, schema, memo)
+        for key, prop in schema.get("properties", {}).items()
+    }
+    memo[schema_id] = example
+    return example
+
+def _now_iso(*_) -> str:
+    return datetime.now().isoformat() + "Z"
+
+# Example values for string fields matched by exact name
+_STRING_KEY_EXAMPLES = {
+    "id": lambda: "123e4567-e89b-12d3-a456-426614174000",
+    "phone": lambda: "123456789",
+    "created_at": _now_iso,
+    "updated_at": _now_iso,
+}
+
+def _string_example(prop: dict, key: str, full_schema: dict, memo: dict):
+    if "email" in key.lower():
+        return "user@example.com"
+    handler = _STRING_KEY_EXAMPLES.get(key)
+    if handler:
+        return handler()
+    return f"Example {key.replace('_', ' ').title()}"
+
+def _integer_example(prop: dict, key: str, full_schema: dict, memo: dict):
+    lowered = key.lower()
+    if "per_page" in lowered or "pages" in lowered:
+        return 10
+    elif "page" in lowered:
+        return 1
+    return 100
+
+def _array_example(prop: dict, key: str, full_schema: dict, memo: dict):
+    items_schema = prop.get("items", {})
+    # Handle $ref references in array items (e.g., List[UserRead])
+    if items_schema.get("$ref"):
+        referenced_schema = resolve_ref(items_schema["$ref"], full_schema)
+        if referenced_schema:
+            item_example = generate_example_from_schema(referenced_schema, memo)
+            return [item_example] if item_example else []
+    return []
+
+def _object_example(prop: dict, key: str, full_schema: dict, memo: dict):
+    # Handle Dict[str, List[str]]
+    if "additionalProperties" in prop:
+        ap = prop["additionalProperties"]
+        if ap.get("type") == "array" and ap.get("items", {}).get("type") == "string":
+            return {"key_1": ["value_1"]}
+    return generate_example_from_schema(prop, memo)
+
+# Example generator per JSON schema type
+_TYPE_EXAMPLES = {
+    "string": _string_example,
+    "integer": _integer_example,
+    "number": lambda *_: 123.45,
+    "boolean": lambda *_: True,
+    "array": _array_example,
+    "object": _object_example,
+}
+
+def generate_property_example(prop: dict, key: str = "", full_schema: dict = None, memo: Optional[dict] = None):
     """Generate example value for a single property based on its type and field name"""
-    prop_type = prop.get("type")
-    
-    if prop_type == "string":
-        if key == "id":
-            return "123e4567-e89b-12d3-a456-426614174000"
-        elif "email" in key.lower():
-            return "user@example.com"
-        elif key == "phone":
-            return "123456789"
-        elif key == "created_at":
-            return datetime.now().isoformat() + "Z"
-        elif key == "updated_at":
-            return datetime.now().isoformat() + "Z"
-        else:
-            return f"Example {key.replace('_', ' ').title()}"
-    elif prop_type == "integer":
-        if "per_page" in key.lower():
-            return 10
-        elif "pages" in key.lower():
-            return 10        
-        elif "page" in key.lower():
-            return 1
-        else:
-            return 100
-    elif prop_type == "number":
-        return 123.45
-    elif prop_type == "boolean":
-        return True
-    elif prop_type == "array":
-        items_schema = prop.get("items", {})
-        # Handle $ref references in array items (e.g., List[UserRead])
-        if items_schema.get("$ref"):
-            referenced_schema = resolve_ref(items_schema["$ref"], full_schema)
-            if referenced_schema:
-                item_example = generate_example_from_schema(referenced_schema)
-                return [item_example] if item_example else []
-        return []
-    elif prop_type == "object":
-        # Handle Dict[str, List[str]]
-        if "additionalProperties" in prop:
-            ap = prop["additionalProperties"]
-            if ap.get("type") == "array" and ap.get("items", {}).get("type") == "string":
-                return {"key_1": ["value_1"]}
-        return generate_example_from_schema(prop)
+    if memo is None:
+        memo = {}
+    handler = _TYPE_EXAMPLES.get(prop.get("type"))
+    if handler:
+        return handler(prop, key, full_schema, memo)
     elif prop.get("format") == "date-time":
-        return datetime.now().isoformat() + "Z"
+        return _now_iso()
     elif prop.get("anyOf"):
-        options = prop.get("anyOf", [])
-        for option in options:
-            if option.get("type") != "null":
-                return generate_property_example(option, key, full_schema)
-        return None
+        option = next((option for option in prop["anyOf"] if option.get("type") != "null"), None)
+        return None if option is None else generate_property_example(option, key, full_schema, memo)
     else:
         return None
 
+@lru_cache(maxsize=256)
+def _parse_ref(ref_path: str) -> Optional[tuple]:
+    """Parse a local reference path once: "#/$defs/UserRead" -> ("$defs", "UserRead")"""
+    if not ref_path.startswith("#/"):
+        return None
+    return tuple(ref_path[2:].split("/"))
+
 def resolve_ref(ref_path: str, schema: dict) -> dict:
     """
     Resolve JSON Schema $ref references to actual schema definitions
     """
-    if not ref_path.startswith("#/"):
+    path_parts = _parse_ref(ref_path)
+    if path_parts is None:
         return None
     
-    # Parse reference path: "#/$defs/UserRead" -> ["$defs", "UserRead"]
-    path_parts = ref_path[2:].split("/")
     current = schema
     
     # Navigate through nested dict structure following the path
@@ -208,4 +245,6 @@ common_responses = {
             "data": None
         }
     )
-}
\ No newline at end of file
+}
+
+_COMMON_RESPONSE_DOCS = _compile_responses(common_responses)
@@ -1,4 +1,4 @@
-import json
+import orjson
 import logging
 from typing import Annotated
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status, Depends
@@ -11,6 +11,17 @@ logger = logging.getLogger(__name__)
 
 REDIS_ONLINE_USERS_KEY = "ws:online_users"
 
+# Serialized once; clients read text frames, so it stays a str
+_PONG_FRAME = orjson.dumps({"type": "pong"}).decode()
+
+# Exact heartbeat frames (compact and json.dumps spacing) -> message type
+_HEARTBEAT_FRAMES = {
+    '{"type":"ping"}': "ping",
+    '{"type": "ping"}': "ping",
+    '{"type":"pong"}': "pong",
+    '{"type": "pong"}': "pong",
+}
+
 @router.websocket("/")
 async def websocket_endpoint(
     websocket: WebSocket,
@@ -32,29 +43,35 @@ async def websocket_endpoint(
         return
 
     sid = await ws_manager.connect(websocket, userinfo)
+    sub = userinfo.get('sub', 'unknown user')
 
     try:
         while True:
             data = await websocket.receive_text()
-            try:
-                msg = json.loads(data)
-            except Exception:
-                msg = {}
+            # Bare heartbeat frames are matched verbatim and skip JSON parsing
+            msg_type = _HEARTBEAT_FRAMES.get(data)
+            if msg_type is None:
+                try:
+                    msg = orjson.loads(data)
+                except Exception:
+                    msg = {}
+                if isinstance(msg, dict):
+                    msg_type = msg.get("type")
 
             # Handle client-sent ping (client active heartbeat)
-            if isinstance(msg, dict) and msg.get("type") == "ping":
+            if msg_type == "ping":
                 await ws_manager.update_heartbeat(sid, "ping")
-                await websocket.send_text(json.dumps({"type": "pong"}))
-                logger.info(f"Received ping from {userinfo.get('sub', 'unknown user')}")
+                await websocket.send_text(_PONG_FRAME)
+                logger.info("Received ping from %s", sub)
                 continue
             
             # Handle client-sent pong (response to server ping)
-            if isinstance(msg, dict) and msg.get("type") == "pong":
+            if msg_type == "pong":
                 await ws_manager.update_heartbeat(sid, "pong")
-                logger.info(f"Received pong from {userinfo.get('sub', 'unknown user')}")
+                logger.info("Received pong from %s", sub)
                 continue
 
-            logger.info(f"Received from {userinfo.get('sub', 'unknown user')}: {data}")
-            await ws_manager.broadcast("message", f"{userinfo.get('sub', 'unknown user')} says: {data}")
+            logger.info("Received from %s: %s", sub, data)
+            await ws_manager.broadcast("message", f"{sub} says: {data}")
     except WebSocketDisconnect:
         await ws_manager.disconnect(sid)
\ No newline at end of file
@@ -1,41 +1,112 @@
 import os
-import json
+import time
+import orjson
 import uuid
 import logging
 import asyncio
 from datetime import datetime
+from collections import deque
+from dataclasses import dataclass
 from fastapi import WebSocket
 from core.redis import get_redis
-from sqlalchemy import select, asc
+from sqlalchemy import select, desc
 from extensions.keycloak import get_keycloak
 from models.websocket_events import WebSocketEvents
 from utils.get_real_ip import get_real_ip_websocket
 from utils.custom_exception import RoleNotFoundException, UserNotFoundException
 
+logger = logging.getLogger(__name__)
+heartbeat_logger = logging.getLogger("websocket_heartbeat")
+
+# Each worker imports this module in its own process
+_process_id = os.getpid()
+
+BROADCAST_CHANNEL = "ws:broadcast"
+BROADCAST_RETRY_INITIAL_SECONDS = 1
+BROADCAST_RETRY_MAX_SECONDS = 30
+
+# Connection entries expire unless a heartbeat refreshes them, so state left
+# behind by a crashed worker cleans itself up. Longer than the idle timeout
+# plus the cleanup interval, so live connections never lapse.
+CONNECTION_TTL_SECONDS = 900
+
+# Every worker runs the startup sweep; the lock lets only the first one
+# through so simultaneous starts do not repeat it
+RESET_LOCK_KEY = "ws:reset_lock"
+RESET_LOCK_TTL_SECONDS = 30
+
+# Connect/disconnect events are buffered in memory and pushed to
+# ws:event_queue in batches instead of one RPUSH per event
+EVENT_FLUSH_INTERVAL_SECONDS = 0.1
+EVENT_FLUSH_BATCH_SIZE = 500
+# Upper bound while Redis is unreachable or no flusher is running
+EVENT_BUFFER_MAX_SIZE = 10000
+
+# Heartbeat frames never change, so serialize them once
+PING_FRAME = orjson.dumps({"type": "ping"}).decode()
+
+@dataclass(slots=True)
+class Connection:
+    """
+    A websocket connection held by this worker
+    """
+    sid: str
+    user_id: str
+    email: str
+    ip: str
+    connected_time: str
+    last_heartbeat: str
+    websocket: WebSocket
+    # Monotonic time of the last heartbeat, used for idle checks
+    last_seen: float = 0.0
+
+    def info(self):
+        """
+        Connection details stored in Redis. The SID and user ID are left out
+        because they are already the hash field and key of the entry.
+        """
+        return {
+            "email": self.email,
+            "ip": self.ip,
+            "connected_time": self.connected_time,
+            "last_heartbeat": self.last_heartbeat
+        }
+
 class ConnectionManager:
     def __init__(self):
+        # Kept ordered by last_seen: connect appends and every heartbeat
+        # moves the connection to the end, so idle ones sit at the front
         self.active_connections = {}
         self._redis_reset = False
+        self._event_buf = deque()
 
     async def reset_redis_connections(self):
         """
-        Reset all connection status in Redis
+        Remove users from ws:online_users whose connection hash has expired
+        or been deleted. Live entries, including other workers', are kept.
         """
         redis = get_redis()
-        online_users = await redis.smembers("ws:online_users")
-        
-        for user_id in online_users:
-            await redis.delete(f"ws:online_users:{user_id}")
-            await redis.delete(f"ws:userinfo:{user_id}")        
-        await redis.delete("ws:online_users")        
+        online_users = list(await redis.smembers("ws:online_users"))
+        if online_users:
+            async with redis.pipeline(transaction=False) as pipe:
+                for user_id in online_users:
+                    pipe.exists(f"ws:online_users:{user_id}")
+                alive = await pipe.execute()
+            stale = [user_id for user_id, exists in zip(online_users, alive) if not exists]
+            if stale:
+                await redis.srem("ws:online_users", *stale)
         self._redis_reset = True
 
     async def ensure_redis_reset(self):
         """
-        Ensure Redis status is reset
+        Ensure Redis status is reset, once across all workers
         """
-        if not self._redis_reset:
+        if self._redis_reset:
+            return
+        redis = get_redis()
+        if await redis.set(RESET_LOCK_KEY, _process_id, nx=True, ex=RESET_LOCK_TTL_SECONDS):
             await self.reset_redis_connections()
+        self._redis_reset = True
 
     async def connect(self, websocket: WebSocket, userinfo: dict):
         await self.ensure_redis_reset()
@@ -45,160 +116,253 @@ class ConnectionManager:
         ip = get_real_ip_websocket(websocket)
         
         now = datetime.now().astimezone().isoformat()
-        conn_info = {
-            "sid": sid,
-            "user_id": userinfo.get("sub"),
-            "email": userinfo.get("email", ""),
-            "ip": ip,
-            "connected_time": now,
-            "last_heartbeat": now
-        }
-        self.active_connections[sid] = {
-            **conn_info,
-            "websocket": websocket
-        }
-        await self._add_online_user_redis(conn_info)
-        await self.log_ws_event_to_redis("connect", userinfo.get("sub"), ip)
+        conn = Connection(
+            sid=sid,
+            user_id=userinfo.get("sub"),
+            email=userinfo.get("email", ""),
+            ip=ip,
+            connected_time=now,
+            last_heartbeat=now,
+            websocket=websocket,
+            last_seen=time.monotonic()
+        )
+        self.active_connections[sid] = conn
+        await self._add_online_user_redis(conn)
+        await self.log_ws_event_to_redis("connect", userinfo.get("sub"), ip, now)
         return sid
 
     async def disconnect(self, sid):
-        conn_info = self.active_connections.pop(sid, None)
-        if conn_info:
-            asyncio.create_task(self._remove_online_user_redis(conn_info))
-            await self.log_ws_event_to_redis("disconnect", conn_info["user_id"], conn_info["ip"])
+        conn = self.active_connections.pop(sid, None)
+        if conn:
+            asyncio.create_task(self._remove_online_user_redis(conn))
+            await self.log_ws_event_to_redis("disconnect", conn.user_id, conn.ip)
 
-    async def _add_online_user_redis(self, conn_info):
+    async def _add_online_user_redis(self, conn):
         redis = get_redis()
-        user_id = conn_info["user_id"]
-        sid = conn_info["sid"]
-        await redis.hset(f"ws:online_users:{user_id}", sid, json.dumps(conn_info))
-        await redis.sadd("ws:online_users", user_id)
-        await redis.set(f"ws:userinfo:{user_id}", json.dumps({
-            "user_id": user_id,
-            "email": conn_info["email"],
-            "ip": conn_info["ip"]
-        }))
+        user_id = conn.user_id
+        sid = conn.sid
+        # One round-trip for all connect-time writes
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(f"ws:online_users:{user_id}", sid, orjson.dumps(conn.info()))
+            pipe.hexpire(f"ws:online_users:{user_id}", CONNECTION_TTL_SECONDS, sid)
+            pipe.sadd("ws:online_users", user_id)
+            pipe.set(f"ws:userinfo:{user_id}", orjson.dumps({
+                "user_id": user_id,
+                "email": conn.email,
+                "ip": conn.ip
+            }), ex=CONNECTION_TTL_SECONDS)
+            await pipe.execute()
 
-    async def _remove_online_user_redis(self, conn_info):
-        redis = get_redis()
-        user_id = conn_info["user_id"]
-        sid = conn_info["sid"]
-        await redis.hdel(f"ws:online_users:{user_id}", sid)
-        if not await redis.hlen(f"ws:online_users:{user_id}"):
-            await redis.srem("ws:online_users", user_id)
-            await redis.delete(f"ws:userinfo:{user_id}")    
-
-    async def log_ws_event_to_redis(self, event_type, user_id, ip):
+    async def _remove_online_user_redis(self, conn):
         redis = get_redis()
+        user_id = conn.user_id
+        sid = conn.sid
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hdel(f"ws:online_users:{user_id}", sid)
+            pipe.hlen(f"ws:online_users:{user_id}")
+            _, remaining = await pipe.execute()
+        if not remaining:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.srem("ws:online_users", user_id)
+                pipe.delete(f"ws:userinfo:{user_id}")
+                await pipe.execute()
+
+    async def log_ws_event_to_redis(self, event_type, user_id, ip, now=None):
+        """
+        Queue an event for flush_ws_events; nothing waits on Redis here
+        """
         event = {
             "event_type": event_type,
             "user_id": user_id,
             "ip": ip,
-            "time": datetime.now().astimezone().isoformat()
+            "time": now or datetime.now().astimezone().isoformat()
         }
-        await redis.rpush("ws:event_queue", json.dumps(event))
+        if len(self._event_buf) >= EVENT_BUFFER_MAX_SIZE:
+            logger.warning(f"Websocket event buffer full, dropping {event_type} event for {user_id}")
+            return
+        self._event_buf.append(orjson.dumps(event))
+
+    async def _push_buffered_events(self):
+        redis = get_redis()
+        while self._event_buf:
+            batch = [self._event_buf.popleft() for _ in range(min(len(self._event_buf), EVENT_FLUSH_BATCH_SIZE))]
+            try:
+                await redis.rpush("ws:event_queue", *batch)
+            except Exception:
+                # Put the batch back in front so nothing is lost or reordered
+                self._event_buf.extendleft(reversed(batch))
+                raise
+
+    async def flush_ws_events(self):
+        """
+        Push buffered events to ws:event_queue with one RPUSH per batch.
+        Runs until cancelled, then flushes whatever is still buffered.
+        """
+        try:
+            while True:
+                await asyncio.sleep(EVENT_FLUSH_INTERVAL_SECONDS)
+                try:
+                    await self._push_buffered_events()
+                except Exception as e:
+                    logger.error(f"Flush websocket events failed: {e}")
+        finally:
+            await self._push_buffered_events()
 
     async def send_heartbeat_ping(self):
         """
         Send heartbeat ping to all connections in Redis
         Returns (success_count, failed_count)
         """
-        logger = logging.getLogger("websocket_heartbeat")
-        
         sent = 0
         failed = 0
-        process_id = os.getpid()
-        now = datetime.now().astimezone().isoformat()
         
         redis = get_redis()
-        online_users = await redis.smembers("ws:online_users")
-        total_redis_connections = 0
+        online_users = list(await redis.smembers("ws:online_users"))
+        sids = [
+            sid
+            for user_sids in await self._fetch_user_sids(redis, online_users)
+            for sid in user_sids
+            if sid in self.active_connections
+        ]
         
-        for user_id in online_users:
-            user_connections = await redis.hgetall(f"ws:online_users:{user_id}")
-            total_redis_connections += len(user_connections)
-            
-            for sid, conn_json in list(user_connections.items()):
-                try:
-                    conn_info = json.loads(conn_json)
-                    
-                    if sid in self.active_connections:
-                        ws = self.active_connections[sid]["websocket"]
-                        try:
-                            await ws.send_text(json.dumps({"type": "ping"}))
-                            await redis.hset(f"ws:online_users:{user_id}", sid, json.dumps(conn_info))
-                            sent += 1
-
-                        except Exception as e:
-                            failed += 1
-                            
-                except Exception as e:
-                    logger.error(f"[PID:{process_id}] Error processing SID {sid}: {e}")     
+        # Send every ping concurrently so one slow socket does not delay the rest
+        results = await asyncio.gather(
+            *(self.active_connections[sid].websocket.send_text(PING_FRAME) for sid in sids),
+            return_exceptions=True,
+        )
+        for sid, result in zip(sids, results):
+            if isinstance(result, Exception):
+                failed += 1
+                heartbeat_logger.warning(f"[PID:{_process_id}] Ping to SID {sid} failed: {result}")
+            else:
+                sent += 1
         return sent, failed
 
+    @staticmethod
+    async def _fetch_user_sids(redis, user_ids):
+        """
+        Fetch the connection SIDs of several users in one round-trip.
+        Returns a list of SID lists in the same order as user_ids.
+        """
+        if not user_ids:
+            return []
+        async with redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.hkeys(f"ws:online_users:{user_id}")
+            return await pipe.execute()
+
+    async def _send_to_sids(self, sids, message):
+        """
+        Send one message to the given local connections concurrently.
+        Connections whose send fails are disconnected.
+        Returns the number of successful sends.
+        """
+        sids = [sid for sid in sids if sid in self.active_connections]
+        results = await asyncio.gather(
+            *(self.active_connections[sid].websocket.send_text(message) for sid in sids),
+            return_exceptions=True,
+        )
+        sent = 0
+        for sid, result in zip(sids, results):
+            if isinstance(result, Exception):
+                await self.disconnect(sid)
+            else:
+                sent += 1
+        return sent
+
     async def update_heartbeat(self, sid, msg_type="ping"):
         """
         Update heartbeat status
         msg_type: "ping" means received ping from client, "pong" means received pong response from client
         """
         now = datetime.now().astimezone().isoformat()
-        conn = self.active_connections.get(sid)
+        conn = self.active_connections.pop(sid, None)
         if conn:
-            conn["last_heartbeat"] = now
-            
-            if msg_type == "pong":            
-                user_id = conn["user_id"]
-                conn_info = {k: v for k, v in conn.items() if k != "websocket"}
-                conn_info["last_heartbeat"] = now
-            
+            conn.last_heartbeat = now
+            conn.last_seen = time.monotonic()
+            self.active_connections[sid] = conn
             redis = get_redis()
-            await redis.hset(f"ws:online_users:{user_id}", sid, json.dumps(conn_info))
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hset(f"ws:online_users:{conn.user_id}", sid, orjson.dumps(conn.info()))
+                pipe.hexpire(f"ws:online_users:{conn.user_id}", CONNECTION_TTL_SECONDS, sid)
+                # Re-register the user in case a sweep dropped them meanwhile
+                pipe.sadd("ws:online_users", conn.user_id)
+                pipe.expire(f"ws:userinfo:{conn.user_id}", CONNECTION_TTL_SECONDS)
+                await pipe.execute()
 
     async def heartbeat_checker(self, timeout_seconds=60):
         """
         Check all connections and remove idle connections.
         Return the number of removed connections.
         """
-        now = datetime.now().astimezone()
+        deadline = time.monotonic() - timeout_seconds
         to_remove = []
-        for sid, conn in list(self.active_connections.items()):
-            last_heartbeat = datetime.fromisoformat(conn["last_heartbeat"])
-            if (now - last_heartbeat).total_seconds() > timeout_seconds:
-                ws = conn["websocket"]
+        for sid, conn in self.active_connections.items():
+            # Everything after the first fresh connection is fresher still
+            if conn.last_seen > deadline:
+                break
+            to_remove.append(sid)
+        for sid in to_remove:
+            conn = self.active_connections.get(sid)
+            if conn:
                 try:
-                    await ws.close()
+                    await conn.websocket.close()
                 except Exception:
                     pass
-                to_remove.append(sid)
-        for sid in to_remove:
             await self.disconnect(sid)
         return len(to_remove)
 
     async def broadcast(self, msg_type: str, data):
+        """
+        Publish a message to every worker; each one forwards it to its own
+        connections from listen_broadcasts.
+        """
         message = self.build_ws_message(msg_type, data)
-        to_remove = []
-        for sid, connection in self.active_connections.items():
-            ws = connection["websocket"]
+        redis = get_redis()
+        await redis.publish(BROADCAST_CHANNEL, message)
+
+    async def _local_broadcast(self, message):
+        # Nothing to send when this worker holds no connections
+        if not self.active_connections:
+            return
+        await self._send_to_sids(list(self.active_connections), message)
+
+    async def listen_broadcasts(self):
+        """
+        Forward messages published on the broadcast channel to the
+        connections held by this worker. Resubscribes with backoff when the
+        subscription drops and runs until cancelled.
+        """
+        delay = BROADCAST_RETRY_INITIAL_SECONDS
+        while True:
+            pubsub = get_redis().pubsub()
             try:
-                await ws.send_text(message)
+                await pubsub.subscribe(BROADCAST_CHANNEL)
+                delay = BROADCAST_RETRY_INITIAL_SECONDS
+                async for msg in pubsub.listen():
+                    if msg["type"] != "message":
+                        continue
+                    try:
+                        await self._local_broadcast(msg["data"])
+                    except Exception as e:
+                        logger.error(f"Broadcast delivery failed: {e}")
             except Exception:
-                to_remove.append(sid)
-        for sid in to_remove:
-            await self.disconnect(sid)
+                logger.exception(f"Broadcast subscription lost, retrying in {delay}s")
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BROADCAST_RETRY_MAX_SECONDS)
 
     async def push_message_to_user(self, user_id: str, msg_type: str, data):
         redis = get_redis()
-        conns = await redis.hgetall(f"ws:online_users:{user_id}")
-        if not conns:
+        sids = await redis.hkeys(f"ws:online_users:{user_id}")
+        if not sids:
             return False
         message = self.build_ws_message(msg_type, data)
-        for sid, conn_json in conns.items():
-            ws = self.active_connections.get(sid, {}).get("websocket")
-            if ws:
-                try:
-                    await ws.send_text(message)
-                except Exception:
-                    await self.disconnect(sid)
+        await self._send_to_sids(sids, message)
         return True
 
     async def push_message_to_role(self, role: str, msg_type: str, data, keycloak=None):
@@ -211,28 +375,28 @@ class ConnectionManager:
         user_ids = [user['id'] for user in users]
         if not user_ids:
             raise UserNotFoundException(f"Role {role} has no users")
-        count = 0
         message = self.build_ws_message(msg_type, data)
-        for user_id in user_ids:
-            redis = get_redis()
-            conns = await redis.hgetall(f"ws:online_users:{user_id}")
-            for sid, conn_json in conns.items():
-                ws = self.active_connections.get(sid, {}).get("websocket")
-                if ws:
-                    try:
-                        await ws.send_text(message)
-                        count += 1
-                    except Exception:
-                        await self.disconnect(sid)
+        redis = get_redis()
+        # One membership check against the online set, then SIDs only for online users
+        online = await redis.smismember("ws:online_users", user_ids)
+        online_ids = [user_id for user_id, is_online in zip(user_ids, online) if is_online]
+        sids = []
+        for user_sids in await self._fetch_user_sids(redis, online_ids):
+            sids.extend(user_sids)
+        count = await self._send_to_sids(sids, message)
         return count
     
     @staticmethod
-    def build_ws_message(msg_type: str, data):
-        return json.dumps({
+    def build_ws_message(msg_type: str, data, now=None):
+        """
+        Serialize a message frame once so it can be shared by every send.
+        Pass now (an ISO timestamp) to reuse a timestamp already taken.
+        """
+        return orjson.dumps({
             "type": msg_type,
-            "time": datetime.now().astimezone().isoformat(),
+            "time": now or datetime.now().astimezone().isoformat(),
             "data": data
-        })
+        }).decode()
 
     @staticmethod
     async def get_user_last_ws_login(user_id, db):
@@ -241,27 +405,21 @@ class ConnectionManager:
         - If the user is still online, return (True, current time)
         - If the user is offline, return (False, last disconnect/timeout time)
         """
+        redis = get_redis()
+        if await redis.exists(f"ws:online_users:{user_id}"):
+            return True, datetime.now()
+
         stmt = (
-            select(WebSocketEvents)
-            .where(WebSocketEvents.user_id == user_id)
-            .order_by(asc(WebSocketEvents.event_time))
+            select(WebSocketEvents.event_time)
+            .where(
+                WebSocketEvents.user_id == user_id,
+                WebSocketEvents.event_type == "disconnect",
+            )
+            .order_by(desc(WebSocketEvents.event_time))
+            .limit(1)
         )
         result = await db.execute(stmt)
-        events = result.scalars().all()
-
-        online_count = 0
-        last_disconnect_time = None
-        for event in events:
-            if event.event_type == "connect":
-                online_count += 1
-            elif event.event_type == "disconnect":
-                online_count = max(0, online_count - 1)
-                last_disconnect_time = event.event_time
-
-        if online_count > 0:
-            return True, datetime.now()
-        else:
-            return False, last_disconnect_time
+        return False, result.scalar_one_or_none()
 
 # 全局實例（用於依賴注入）
 _manager_instance = None